@@ -0,0 +1,34 @@
+"""merge user email indexes
+
+Revision ID: 3c1f5a9d2b40
+Revises: e7985ff64dc7
+Create Date: 2026-10-17 11:04:52.630914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f5a9d2b40"
+down_revision: Union[str, None] = "e7985ff64dc7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_user_email", table_name="users")
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index(
+        "ix_users_email",
+        "users",
+        ["email"],
+        unique=True,
+        postgresql_include=["id", "hashed_password", "is_active"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_user_email", "users", ["email"], unique=False)
@@ -0,0 +1,31 @@
+"""add row version columns
+
+Revision ID: 9b2e4d7c1a85
+Revises: 3c1f5a9d2b40
+Create Date: 2026-10-17 14:37:09.152663
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2e4d7c1a85"
+down_revision: Union[str, None] = "3c1f5a9d2b40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("users", "roles", "groups"):
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in ("users", "roles", "groups"):
+        op.drop_column(table, "version")
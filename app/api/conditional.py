@@ -0,0 +1,63 @@
+from typing import Any, Optional, Union
+
+from fastapi import Response, status
+
+from app.exceptions import PreconditionFailedError
+from app.services.base_service import BaseService
+
+
+def make_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match/If-Match header."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def parse_if_match(header: Optional[str]) -> Optional[list[int]]:
+    """Return the row versions an ``If-Match`` header accepts.
+
+    ``None`` means any version will do (no header or ``*``). Weak tags never
+    match under the strong comparison If-Match requires, so a header without
+    any usable tag fails the precondition outright.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith('"') and tag.endswith('"') and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    if not versions:
+        raise PreconditionFailedError("If-Match does not name a current version")
+    return versions
+
+
+async def get_with_etag(
+    service: BaseService,
+    entity_id: Any,
+    response: Response,
+    if_none_match: Optional[str],
+) -> Union[Any, Response]:
+    """Fetch an entity for a GET, honouring ``If-None-Match``.
+
+    When the client's tag is still current a bare 304 is returned after
+    looking up only the row version; otherwise the entity is loaded and its
+    ``ETag`` header set on ``response``.
+    """
+    if if_none_match:
+        version = await service.get_version(entity_id)
+        if version is not None and etag_matches(if_none_match, make_etag(version)):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": make_etag(version)},
+            )
+    # Missing entities raise NotFoundError here
+    entity = await service.get_by_id(entity_id)
+    response.headers["ETag"] = make_etag(entity.version)
+    return entity
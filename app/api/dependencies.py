@@ -1,35 +1,92 @@
 from fastapi import Depends, HTTPException, status
-from jose import JWTError, jwt
 
+from app.core.rate_limit import AuthRateLimiter, Bucket
 from app.core.redis_client import redis_client
-from app.core.security import oauth2_scheme
+from app.core.security import decode_access_token, oauth2_scheme
 from app.core.settings import settings
 from app.db.repositories.group_repo import GroupRepository
 from app.db.repositories.role_repo import RoleRepository
 from app.db.repositories.user_repo import UserRepository
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, get_read_session_factory
+from app.schemas.user import UserCreate
 from app.services.auth_service import AuthService
+from app.services.export_service import ExportService
 from app.services.group_service import GroupService
+from app.services.import_service import ImportService
 from app.services.role_service import RoleService
 from app.services.user_service import UserService
 
 
+def get_redis_client():
+    return redis_client
+
+
 def get_user_repository(db=Depends(get_db)) -> UserRepository:
     return UserRepository(db)
 
 
 def get_user_service(
-    repo=Depends(get_user_repository), redis=Depends(lambda: redis_client)
+    repo=Depends(get_user_repository), redis=Depends(get_redis_client)
+) -> UserService:
+    return UserService(repo, redis)
+
+
+def get_user_read_repository(db=Depends(get_read_db)) -> UserRepository:
+    return UserRepository(db)
+
+
+def get_user_read_service(
+    repo=Depends(get_user_read_repository), redis=Depends(get_redis_client)
 ) -> UserService:
     return UserService(repo, redis)
 
 
+def get_user_export_service(
+    session_factory=Depends(get_read_session_factory),
+) -> ExportService:
+    return ExportService(
+        session_factory,
+        UserRepository,
+        fields=(
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "is_active",
+            "is_superuser",
+        ),
+        batch_size=settings.EXPORT_BATCH_SIZE,
+    )
+
+
+def get_user_import_service(
+    service=Depends(get_user_service),
+) -> ImportService:
+    return ImportService(
+        service,
+        UserCreate,
+        conflict_field="email",
+        batch_size=settings.IMPORT_BATCH_SIZE,
+        max_errors=settings.IMPORT_MAX_ERRORS,
+    )
+
+
 def get_group_repository(db=Depends(get_db)) -> GroupRepository:
     return GroupRepository(db)
 
 
 def get_group_service(
-    repo=Depends(get_group_repository), redis=Depends(lambda: redis_client)
+    repo=Depends(get_group_repository), redis=Depends(get_redis_client)
+) -> GroupService:
+    return GroupService(repo, redis)
+
+
+def get_group_read_repository(db=Depends(get_read_db)) -> GroupRepository:
+    return GroupRepository(db)
+
+
+def get_group_read_service(
+    repo=Depends(get_group_read_repository), redis=Depends(get_redis_client)
 ) -> GroupService:
     return GroupService(repo, redis)
 
@@ -39,31 +96,63 @@ def get_role_repository(db=Depends(get_db)) -> RoleRepository:
 
 
 def get_role_service(
-    repo=Depends(get_role_repository), redis=Depends(lambda: redis_client)
+    repo=Depends(get_role_repository), redis=Depends(get_redis_client)
 ) -> RoleService:
     return RoleService(repo, redis)
 
 
+def get_role_read_repository(db=Depends(get_read_db)) -> RoleRepository:
+    return RoleRepository(db)
+
+
+def get_role_read_service(
+    repo=Depends(get_role_read_repository), redis=Depends(get_redis_client)
+) -> RoleService:
+    return RoleService(repo, redis)
+
+
+def get_auth_rate_limiter(redis=Depends(get_redis_client)) -> AuthRateLimiter:
+    return AuthRateLimiter(
+        redis,
+        email_bucket=Bucket(
+            "email",
+            settings.AUTH_RATE_LIMIT_EMAIL_BURST,
+            settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE,
+        ),
+        client_bucket=Bucket(
+            "client",
+            settings.AUTH_RATE_LIMIT_CLIENT_BURST,
+            settings.AUTH_RATE_LIMIT_CLIENT_PER_MINUTE,
+        ),
+        enabled=settings.AUTH_RATE_LIMIT_ENABLED,
+    )
+
+
 def get_auth_service(repo=Depends(get_user_repository)) -> AuthService:
     return AuthService(repo)
 
 
-async def get_current_user(
+async def get_current_claims(
     token: str = Depends(oauth2_scheme),
-) -> str:
+) -> dict:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return email
-    except JWTError as exc:
+        payload = decode_access_token(token)
+    except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+async def get_current_user(
+    claims: dict = Depends(get_current_claims),
+) -> str:
+    return claims["sub"]
@@ -0,0 +1,155 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from app.core.settings import settings
+from app.db.instrumentation import track_queries
+from app.db.routing import client_key
+from app.db.session import database, primary_stickiness
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def read_only(endpoint):
+    """Mark an endpoint using an unsafe method as not writing anything.
+
+    Successful calls to it do not pin the client to the primary, e.g. for
+    lookups that take their keys in a POST body.
+    """
+    endpoint.read_only = True
+    return endpoint
+
+
+def _is_read_only(scope) -> bool:
+    # Routing has filled in the matched route by the time a response starts
+    endpoint = getattr(scope.get("route"), "endpoint", None)
+    return getattr(endpoint, "read_only", False)
+
+
+class ReadYourWritesMiddleware:
+    """Pins clients to the primary database for a short while after a write.
+
+    Any successful request with an unsafe method counts as a write, unless
+    its endpoint is marked with ``read_only``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not database.has_replica
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+                and not _is_read_only(scope)
+            ):
+                primary_stickiness.mark(client_key(scope))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class RouteMetricsMiddleware:
+    """Records request latency and in-flight requests for a single route.
+
+    It wraps the route's own ASGI app, so the route template used as the label
+    is known up front and no per-request route lookup is needed; requests that
+    match no route are not recorded. Latency includes streaming the body.
+    """
+
+    def __init__(self, app, route: str):
+        self.app = app
+        self.route = route
+        self._in_progress = {}
+        self._durations = {}
+
+    def _duration(self, method: str, status: int):
+        key = (method, status)
+        child = self._durations.get(key)
+        if child is None:
+            child = self._durations[key] = HTTP_REQUEST_DURATION.labels(
+                method, self.route, str(status)
+            )
+        return child
+
+    async def __call__(self, scope, receive, send):
+        method = scope["method"]
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = HTTP_REQUESTS_IN_PROGRESS.labels(
+                method, self.route
+            )
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._duration(method, status).observe(time.perf_counter() - start)
+            in_progress.dec()
+
+
+def instrument_routes(app: FastAPI):
+    """Wrap every API route of ``app`` in ``RouteMetricsMiddleware``."""
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.app = RouteMetricsMiddleware(route.app, route.path)
+
+
+class QueryStatsMiddleware:
+    """Counts the SQL statements each request runs.
+
+    The count and total database time go out as ``X-DB-Query-Count`` and
+    ``X-DB-Query-Time`` (milliseconds) response headers. Statement shapes a
+    request runs more than ``N_PLUS_ONE_THRESHOLD`` times, typically a lazy
+    relationship loaded per row, are logged as warnings. Queries issued while
+    a streaming body is sent are not in the headers but are still checked.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Query-Time"] = f"{stats.duration * 1000:.2f}"
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        route = scope.get("route")
+        for statement, count in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                "Statement ran {count} times in {method} {route}: {statement}",
+                count=count,
+                method=scope["method"],
+                route=route.path if route is not None else scope["path"],
+                statement=statement,
+            )
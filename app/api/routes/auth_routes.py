@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from loguru import logger
 from pydantic import BaseModel, EmailStr
 
-from app.api.dependencies import get_user_service
-from app.core.security import create_access_token, decode_access_token, verify_password
+from app.api.dependencies import get_auth_rate_limiter, get_user_service
+from app.core.rate_limit import AuthRateLimiter
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    verify_password_async,
+)
 from app.db.models import User
-from app.exceptions import ForbiddenError, NotFoundError, ValidationError
+from app.exceptions import (
+    ForbiddenError,
+    NotFoundError,
+    ServiceUnavailableError,
+    ValidationError,
+)
 from app.schemas.auth import Token
 from app.schemas.user import UserCreate, UserRetrieve
 from app.services.user_service import UserService
@@ -18,44 +30,55 @@ class LoginRequest(BaseModel):
     password: str
 
 
+def _client_address(request: Request) -> Optional[str]:
+    return request.client.host if request.client else None
+
+
 @router.post("/register", response_model=Token)
 async def register_user(
     user_create: UserCreate,
+    request: Request,
     service: UserService = Depends(get_user_service),
+    rate_limiter: AuthRateLimiter = Depends(get_auth_rate_limiter),
 ) -> Token:
-    logger.info(f"Registering user with data: {user_create.model_dump()}")
-    existing_user: list[User] = await service.get_by_field(
-        field_name="email", value=user_create.email
-    )
-    if existing_user:
-        logger.warning(f"User with email {user_create.email} already exists")
-        raise ValidationError("User with this email already exists")
+    await rate_limiter.check("register", _client_address(request), user_create.email)
+    logger.info("Registering a new user")
     try:
-        new_user: User = await service.create(user_create)
-        logger.info(f"User created successfully with ID: {new_user.id}")
-        token = create_access_token(data={"sub": new_user.email, "id": new_user.id})
-        logger.debug(f"Token: {token}")
-        return {"access_token": token, "token_type": "bearer"}
+        new_user: Optional[User] = await service.register(user_create)
+    except ServiceUnavailableError:
+        raise
     except Exception as exc:
         logger.exception("Unexpected error while creating user")
         raise ValidationError(
             "An unexpected error occurred. Please try again."
         ) from exc
+    if new_user is None:
+        logger.info("Registration rejected: email already in use")
+        raise ValidationError("User with this email already exists")
+    logger.info("Registered user {user_id}", user_id=new_user.id)
+    # A freshly registered user has no roles or groups to look up
+    token = create_access_token(data=service.build_token_claims(new_user))
+    return {"access_token": token, "token_type": "bearer"}
 
 
 @router.post("/login", response_model=Token)
 async def login_user(
     login_request: LoginRequest,
+    request: Request,
     service: UserService = Depends(get_user_service),
+    rate_limiter: AuthRateLimiter = Depends(get_auth_rate_limiter),
 ) -> Token:
-    user: list[User] = await service.get_by_field(
-        field_name="email", value=login_request.email
-    )
-    if not user:
+    await rate_limiter.check("login", _client_address(request), login_request.email)
+    credentials = await service.get_credentials(login_request.email)
+    if credentials is None:
         raise NotFoundError(f"User with email {login_request.email} not found")
-    if not verify_password(login_request.password, user[0].hashed_password):
+    if not await verify_password_async(
+        login_request.password, credentials.hashed_password
+    ):
         raise ForbiddenError(f"Invalid password for user {login_request.email}")
-    token = create_access_token(data={"sub": user[0].email})
+    if credentials.is_active is False:
+        raise ForbiddenError(f"User {login_request.email} is inactive")
+    token = create_access_token(data=await service.get_token_claims(credentials))
     return {"access_token": token, "token_type": "bearer"}
 
 
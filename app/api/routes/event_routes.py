@@ -0,0 +1,43 @@
+import json
+import re
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from loguru import logger
+
+from app.api.dependencies import get_redis_client
+from app.core.events import read_stream
+from app.core.settings import settings
+from app.exceptions import ValidationError
+from app.schemas.events import EventReplay
+
+router = APIRouter()
+
+STREAM_ID_PATTERN = re.compile(r"^\d+(-\d+)?$")
+
+
+@router.get("/{model}", response_model=EventReplay)
+async def replay_events(
+    model: Literal["user", "group", "role"],
+    after: Optional[str] = None,
+    count: int = Query(100, ge=1, le=settings.EVENT_REPLAY_MAX_COUNT),
+    redis=Depends(get_redis_client),
+) -> EventReplay:
+    """Return change events recorded after the given stream ID.
+
+    Pass the ``next_id`` of the previous response as ``after`` to keep paging;
+    an empty page means the caller has caught up.
+    """
+    if settings.EVENT_BACKEND != "streams":
+        raise ValidationError("Event replay requires the streams event backend")
+    if after is not None and not STREAM_ID_PATTERN.match(after):
+        raise ValidationError("Invalid stream ID")
+    logger.info("Replaying {model} events after {after}", model=model, after=after)
+    entries = await read_stream(redis, f"{model}-events", after, count)
+    return {
+        "events": [
+            {"id": entry_id, "event": json.loads(message)}
+            for entry_id, message in entries
+        ],
+        "next_id": entries[-1][0] if entries else after,
+    }
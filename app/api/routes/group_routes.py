@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from loguru import logger
 
-from app.api.dependencies import get_group_service
+from app.api.conditional import get_with_etag, make_etag, parse_if_match
+from app.api.dependencies import get_group_read_service, get_group_service
+from app.api.serialization import model_response, page_response, response_fields
+from app.core.logs import sampled_logger
+from app.core.settings import settings
 from app.exceptions import NotFoundError, handle_service_exceptions
 from app.schemas.groups import GroupCreate, GroupRetrieve, GroupUpdate
+from app.schemas.pagination import Page
 from app.services.group_service import GroupService
 
 router = APIRouter()
@@ -19,54 +26,64 @@ async def create_group(
 
 @router.get("/by-name", response_model=GroupRetrieve)
 async def get_group_by_name(
-    name: str, service: GroupService = Depends(get_group_service)
+    name: str, service: GroupService = Depends(get_group_read_service)
 ) -> GroupRetrieve:
-    logger.info(f"Fetching group with name: {name}")
+    sampled_logger.info("Fetching group {name}", name=name)
     group = await service.get_by_field("name", name)
     if not group:
-        logger.warning(f"Group with name {name} not found")
+        logger.info("Group {name} not found", name=name)
         raise NotFoundError(f"Group with name {name} not found")
-    logger.info(f"Group retrieved: {group}")
-    return group[0]
+    return model_response(GroupRetrieve, group[0])
 
 
-@router.get("/{group_id}", response_model=GroupRetrieve)
+@router.get(
+    "/{group_id}",
+    response_model=GroupRetrieve,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+)
 async def get_group(
-    group_id: int, service: GroupService = Depends(get_group_service)
+    group_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: GroupService = Depends(get_group_read_service),
 ) -> GroupRetrieve:
-    logger.info(f"Fetching group with ID: {group_id}")
-    result = await service.get_by_id(group_id)
-    if result is None:
-        logger.warning(f"Group with ID {group_id} not found")
-        raise NotFoundError(f"Group with ID {group_id} not found")
-    logger.info(f"Group retrieved: {result}")
-    return result
+    sampled_logger.info("Fetching group {group_id}", group_id=group_id)
+    return await get_with_etag(service, group_id, response, if_none_match)
 
 
-@router.get("/", response_model=list[GroupRetrieve])
+@router.get("/", response_model=Page[GroupRetrieve])
 async def get_groups(
-    service: GroupService = Depends(get_group_service),
-) -> list[GroupRetrieve]:
-    logger.info("Fetching all groups")
-    result = await service.get_all()
-    logger.info(f"Retrieved {len(result)} groups")
-    return result
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    service: GroupService = Depends(get_group_read_service),
+) -> Page[GroupRetrieve]:
+    items, next_cursor = await service.get_page_rows(
+        response_fields(GroupRetrieve), cursor, limit
+    )
+    sampled_logger.info("Retrieved {count} groups", count=len(items))
+    return page_response(items, next_cursor)
 
 
 @router.put("/{group_id}", response_model=GroupRetrieve)
 async def update_group(
     group_id: int,
     group_update: GroupUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     service: GroupService = Depends(get_group_service),
 ) -> GroupRetrieve:
     logger.info(
-        f"Updating group with ID: {group_id} with data: {group_update.model_dump()}"
+        "Updating group {group_id} fields {fields}",
+        group_id=group_id,
+        fields=sorted(group_update.model_fields_set),
+    )
+    result = await service.update(
+        group_id, group_update, expected_versions=parse_if_match(if_match)
     )
-    result = await service.update(group_id, group_update)
     if result is None:
-        logger.warning(f"Group with ID {group_id} not found")
+        logger.warning("Group {group_id} not found", group_id=group_id)
         raise NotFoundError(f"Group with ID {group_id} not found")
-    logger.info(f"Group updated: {result}")
+    response.headers["ETag"] = make_etag(result.version)
     return result
 
 
@@ -74,8 +91,8 @@ async def update_group(
 async def delete_group(
     group_id: int, service: GroupService = Depends(get_group_service)
 ) -> None:
-    logger.info(f"Deleting group with ID: {group_id}")
+    logger.info("Deleting group {group_id}", group_id=group_id)
     response_status = await service.delete(group_id)
     if not response_status:
-        logger.warning(f"Group with ID {group_id} not found")
+        logger.warning("Group {group_id} not found", group_id=group_id)
         raise NotFoundError(f"Group with ID {group_id} not found")
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from loguru import logger
 
-from app.api.dependencies import get_role_service
+from app.api.conditional import get_with_etag, make_etag, parse_if_match
+from app.api.dependencies import get_role_read_service, get_role_service
+from app.api.serialization import model_response, page_response, response_fields
+from app.core.logs import sampled_logger
+from app.core.settings import settings
 from app.exceptions import NotFoundError, handle_service_exceptions
+from app.schemas.pagination import Page
 from app.schemas.roles import RoleCreate, RoleRetrieve, RoleUpdate
 from app.services.role_service import RoleService
 
@@ -19,54 +26,64 @@ async def create_role(
 
 @router.get("/by-name", response_model=RoleRetrieve)
 async def get_role_by_name(
-    name: str, service: RoleService = Depends(get_role_service)
+    name: str, service: RoleService = Depends(get_role_read_service)
 ) -> RoleRetrieve:
-    logger.info(f"Fetching role with name: {name}")
+    sampled_logger.info("Fetching role {name}", name=name)
     role = await service.get_by_field("name", name)
     if not role:
-        logger.warning(f"Role with name {name} not found")
+        logger.info("Role {name} not found", name=name)
         raise NotFoundError(f"Role with name {name} not found")
-    logger.info(f"Role retrieved: {role}")
-    return role[0]
+    return model_response(RoleRetrieve, role[0])
 
 
-@router.get("/{role_id}", response_model=RoleRetrieve)
+@router.get(
+    "/{role_id}",
+    response_model=RoleRetrieve,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+)
 async def get_role(
-    role_id: int, service: RoleService = Depends(get_role_service)
+    role_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: RoleService = Depends(get_role_read_service),
 ) -> RoleRetrieve:
-    logger.info(f"Fetching role with ID: {role_id}")
-    result = await service.get_by_id(role_id)
-    if result is None:
-        logger.warning(f"Role with ID {role_id} not found")
-        raise NotFoundError(f"Role with ID {role_id} not found")
-    logger.info(f"Role retrieved: {result}")
-    return result
+    sampled_logger.info("Fetching role {role_id}", role_id=role_id)
+    return await get_with_etag(service, role_id, response, if_none_match)
 
 
-@router.get("/", response_model=list[RoleRetrieve])
+@router.get("/", response_model=Page[RoleRetrieve])
 async def get_roles(
-    service: RoleService = Depends(get_role_service),
-) -> list[RoleRetrieve]:
-    logger.info("Fetching all roles")
-    result = await service.get_all()
-    logger.info(f"Retrieved {len(result)} roles")
-    return result
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    service: RoleService = Depends(get_role_read_service),
+) -> Page[RoleRetrieve]:
+    items, next_cursor = await service.get_page_rows(
+        response_fields(RoleRetrieve), cursor, limit
+    )
+    sampled_logger.info("Retrieved {count} roles", count=len(items))
+    return page_response(items, next_cursor)
 
 
 @router.put("/{role_id}", response_model=RoleRetrieve)
 async def update_role(
     role_id: int,
     role_update: RoleUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     service: RoleService = Depends(get_role_service),
 ) -> RoleRetrieve:
     logger.info(
-        f"Updating role with ID: {role_id} with data: {role_update.model_dump()}"
+        "Updating role {role_id} fields {fields}",
+        role_id=role_id,
+        fields=sorted(role_update.model_fields_set),
+    )
+    result = await service.update(
+        role_id, role_update, expected_versions=parse_if_match(if_match)
     )
-    result = await service.update(role_id, role_update)
     if result is None:
-        logger.warning(f"Role with ID {role_id} not found")
+        logger.warning("Role {role_id} not found", role_id=role_id)
         raise NotFoundError(f"Role with ID {role_id} not found")
-    logger.info(f"Role updated successfully: {result}")
+    response.headers["ETag"] = make_etag(result.version)
     return result
 
 
@@ -74,8 +91,8 @@ async def update_role(
 async def delete_role(
     role_id: int, service: RoleService = Depends(get_role_service)
 ) -> None:
-    logger.info(f"Deleting role with ID: {role_id}")
+    logger.info("Deleting role {role_id}", role_id=role_id)
     success = await service.delete(role_id)
     if not success:
-        logger.warning(f"Role with ID {role_id} not found")
+        logger.warning("Role {role_id} not found", role_id=role_id)
         raise NotFoundError(f"Role with ID {role_id} not found")
@@ -1,11 +1,44 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from app.api.dependencies import get_current_user, get_user_service
-from app.exceptions import NotFoundError, handle_service_exceptions
-from app.schemas.user import UserCreate, UserRetrieve, UserUpdate
+from app.api.conditional import get_with_etag, make_etag, parse_if_match
+from app.api.dependencies import (
+    get_current_claims,
+    get_user_export_service,
+    get_user_import_service,
+    get_user_read_service,
+    get_user_service,
+)
+from app.api.middleware import read_only
+from app.api.serialization import model_response, page_response, response_fields
+from app.core.logs import sampled_logger
+from app.core.settings import settings
+from app.exceptions import NotFoundError, ValidationError, handle_service_exceptions
+from app.schemas.pagination import Page
+from app.schemas.user import (
+    UserBatchGet,
+    UserBatchGetResult,
+    UserBulkCreateResult,
+    UserCreate,
+    UserImportResult,
+    UserRetrieve,
+    UserUpdate,
+)
+from app.services.export_service import MEDIA_TYPES, ExportFormat, ExportService
+from app.services.import_service import ImportFormat, ImportService
 from app.services.user_service import UserService
 
 router = APIRouter()
@@ -13,15 +46,26 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserRetrieve)
 async def get_current_user_profile(
-    email: str = Depends(get_current_user),
-    service: UserService = Depends(get_user_service),
+    claims: dict = Depends(get_current_claims),
+    service: UserService = Depends(get_user_read_service),
 ) -> UserRetrieve:
-    logger.info(f"Fetching current user (email: {email})")
+    if "id" in claims:
+        sampled_logger.info("Fetching current user {user_id}", user_id=claims["id"])
+        try:
+            user_id = UUID(claims["id"])
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            ) from exc
+        return await service.get_by_id(user_id)
+
+    # Tokens issued before user IDs were embedded only carry the email
+    email = claims["sub"]
+    sampled_logger.info("Fetching current user by email")
     user = await service.get_by_field(field_name="email", value=email)
     if not user:
-        logger.warning(f"User with email {email} not found")
+        logger.warning("Current user not found by email")
         raise NotFoundError(detail="User not found")
-    logger.info(f"User retrieved: {user[0]}")
     return user[0]
 
 
@@ -33,61 +77,184 @@ async def create_user(
     return await service.create(user)
 
 
+@router.post("/bulk", response_model=UserBulkCreateResult)
+@handle_service_exceptions
+async def create_users_bulk(
+    users: list[UserCreate], service: UserService = Depends(get_user_service)
+) -> UserBulkCreateResult:
+    if not users:
+        raise ValidationError("No users to create")
+    if len(users) > settings.BULK_CREATE_MAX:
+        raise ValidationError(
+            f"At most {settings.BULK_CREATE_MAX} users can be created per request"
+        )
+    logger.info("Bulk creating {count} users", count=len(users))
+    created, skipped = await service.create_many(users, conflict_field="email")
+    logger.info(
+        "Created {created} users, skipped {skipped}",
+        created=len(created),
+        skipped=len(skipped),
+    )
+    return {
+        "created": created,
+        "conflicts": [
+            {
+                "index": index,
+                "email": users[index].email,
+                "detail": "User with this email already exists",
+            }
+            for index in skipped
+        ],
+    }
+
+
+@router.post("/batch-get", response_model=UserBatchGetResult)
+@read_only
+@handle_service_exceptions
+async def batch_get_users(
+    lookup: UserBatchGet, service: UserService = Depends(get_user_read_service)
+) -> UserBatchGetResult:
+    if (lookup.ids is None) == (lookup.emails is None):
+        raise ValidationError("Provide either ids or emails")
+    field_name, values = (
+        ("id", lookup.ids) if lookup.ids is not None else ("email", lookup.emails)
+    )
+    values = list(dict.fromkeys(values))
+    if len(values) > settings.BATCH_GET_MAX:
+        raise ValidationError(
+            f"At most {settings.BATCH_GET_MAX} users can be fetched per request"
+        )
+    sampled_logger.info(
+        "Batch fetching {count} users by {field}", count=len(values), field=field_name
+    )
+    users = await service.get_many(field_name, values)
+    found = {getattr(user, field_name): user for user in users}
+    return model_response(
+        UserBatchGetResult,
+        {
+            "items": [found[value] for value in values if value in found],
+            "missing": [str(value) for value in values if value not in found],
+        },
+    )
+
+
+@router.post("/import", response_model=UserImportResult)
+@handle_service_exceptions
+async def import_users(
+    request: Request,
+    response: Response,
+    import_format: ImportFormat = Query("ndjson", alias="format"),
+    service: ImportService = Depends(get_user_import_service),
+) -> UserImportResult:
+    logger.info("Importing users from a {format} stream", format=import_format)
+    summary = await service.run(request.stream(), import_format)
+    if summary["failed"]:
+        # Earlier batches stay committed; the summary says which lines they were
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    logger.info(
+        "Imported {inserted} users, skipped {skipped}, {invalid} invalid, "
+        "{unpublished} without events",
+        inserted=summary["inserted"],
+        skipped=summary["skipped"],
+        invalid=summary["invalid"],
+        unpublished=summary["unpublished"],
+    )
+    return summary
+
+
 @router.get("/by-email", response_model=UserRetrieve)
 async def get_user_by_email(
-    email: str, service: UserService = Depends(get_user_service)
+    email: str, service: UserService = Depends(get_user_read_service)
 ) -> UserRetrieve:
-    logger.info(f"Fetching user with email: {email}")
+    sampled_logger.info("Fetching user by email")
     result = await service.get_by_field(field_name="email", value=email)
     if not result:
-        logger.warning(f"User with email {email} not found")
+        logger.info("User lookup by email found nothing")
         raise NotFoundError(detail=f"User with email {email} not found")
-    return result[0]
+    return model_response(UserRetrieve, result[0])
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    is_active: Optional[bool] = None,
+    is_superuser: Optional[bool] = None,
+    service: ExportService = Depends(get_user_export_service),
+) -> StreamingResponse:
+    filters = {
+        key: value
+        for key, value in {"is_active": is_active, "is_superuser": is_superuser}.items()
+        if value is not None
+    }
+    logger.info(
+        "Exporting users as {format} with filters {filters}",
+        format=export_format,
+        filters=filters,
+    )
+    return StreamingResponse(
+        service.stream(export_format, **filters),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format}"'
+        },
+    )
 
 
-@router.get("/{user_id}", response_model=UserRetrieve)
+@router.get(
+    "/{user_id}",
+    response_model=UserRetrieve,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+)
 async def get_user(
-    user_id: UUID, service: UserService = Depends(get_user_service)
+    user_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: UserService = Depends(get_user_read_service),
 ) -> UserRetrieve:
-    logger.info(f"Fetching user with ID: {user_id}")
-    result = await service.get_by_id(user_id)
-    if result is None:
-        logger.warning(f"User with ID {user_id} not found")
-        raise NotFoundError(detail=f"User with ID {user_id} not found")
-    logger.info(f"User retrieved: {result}")
-    return result
+    sampled_logger.info("Fetching user {user_id}", user_id=user_id)
+    return await get_with_etag(service, user_id, response, if_none_match)
 
 
-@router.get("/", response_model=list[UserRetrieve])
+@router.get("/", response_model=Page[UserRetrieve])
 async def get_users(
-    service: UserService = Depends(get_user_service),
-) -> list[UserRetrieve]:
-    logger.info("Fetching all users")
-    result = await service.get_all()
-    logger.info(f"Retrieved {len(result)} users")
-    return result
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    service: UserService = Depends(get_user_read_service),
+) -> Page[UserRetrieve]:
+    items, next_cursor = await service.get_page_rows(
+        response_fields(UserRetrieve), cursor, limit
+    )
+    sampled_logger.info("Retrieved {count} users", count=len(items))
+    return page_response(items, next_cursor)
 
 
 @router.put("/{user_id}", response_model=UserRetrieve)
 async def update_user(
     user_id: UUID,
     user_update: UserUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     service: UserService = Depends(get_user_service),
 ) -> UserRetrieve:
     logger.info(
-        f"Updating user with ID: {user_id} with data: {user_update.model_dump()}"
+        "Updating user {user_id} fields {fields}",
+        user_id=user_id,
+        fields=sorted(user_update.model_fields_set),
+    )
+    result = await service.update(
+        user_id, user_update, expected_versions=parse_if_match(if_match)
     )
-    result = await service.update(user_id, user_update)
     if not result:
         raise NotFoundError(detail=f"User with ID {user_id} not found")
+    response.headers["ETag"] = make_etag(result.version)
     return result
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(user_id: UUID, service: UserService = Depends(get_user_service)):
-    logger.info(f"Deleting user with ID: {user_id}")
+    logger.info("Deleting user {user_id}", user_id=user_id)
     success = await service.delete(user_id)
     if not success:
-        logger.warning(f"User with ID {user_id} not found")
+        logger.warning("User {user_id} not found", user_id=user_id)
         raise NotFoundError(detail=f"User with ID {user_id} not found")
-    logger.info(f"User with ID {user_id} deleted successfully.")
+    logger.info("Deleted user {user_id}", user_id=user_id)
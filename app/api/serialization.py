@@ -0,0 +1,46 @@
+"""Fast response paths for list and lookup endpoints.
+
+Returning ORM objects from a route makes FastAPI validate each one against
+the ``response_model`` with ``from_attributes``, run ``jsonable_encoder`` over
+the result and only then encode it. The helpers below are used by the hot
+read routes instead:
+
+* ``page_response`` encodes rows fetched straight from Core result tuples
+  with orjson and no validation; the rows come from our own columns and are
+  trusted.
+* ``model_response`` validates ORM objects with a cached ``TypeAdapter`` and
+  serializes them in the same pydantic-core pass.
+
+The routes keep their ``response_model`` for the OpenAPI schema.
+"""
+
+import functools
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+@functools.cache
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+@functools.cache
+def response_fields(schema: type[BaseModel]) -> tuple[str, ...]:
+    """Names of the columns to select for ``schema``."""
+    return tuple(schema.model_fields)
+
+
+def page_response(items: list[dict], next_cursor: Optional[str]) -> ORJSONResponse:
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+def model_response(schema: Any, value: Any) -> Response:
+    """Validate ``value`` (ORM objects included) and encode it as JSON."""
+    adapter = _adapter(schema)
+    return Response(
+        adapter.dump_json(adapter.validate_python(value, from_attributes=True)),
+        media_type="application/json",
+    )
@@ -0,0 +1,183 @@
+from datetime import date, datetime
+import hashlib
+import json
+from typing import Any, Generic, Iterable, Optional, Type, TypeVar
+import uuid
+
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import inspect
+
+ModelType = TypeVar("ModelType")
+
+# KEYS: row key, floor key[, lookup key]; ARGV: row, version, ttl[, entity ID].
+# Writes the row unless the floor is "*" or newer than ``version``.
+SET_SCRIPT = """
+local floor = redis.call("GET", KEYS[2])
+if floor and (floor == "*" or tonumber(ARGV[2]) < tonumber(floor)) then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[3])
+if KEYS[3] then
+    redis.call("SET", KEYS[3], ARGV[4], "EX", ARGV[3])
+end
+return 1
+"""
+
+# KEYS: row key, floor key; ARGV: committed version or "*", ttl.
+# Drops the row and raises the floor; "*" is never lowered.
+INVALIDATE_SCRIPT = """
+local floor = redis.call("GET", KEYS[2])
+if floor ~= "*" and (ARGV[1] == "*" or not floor
+        or tonumber(ARGV[1]) > tonumber(floor)) then
+    redis.call("SET", KEYS[2], ARGV[1], "EX", ARGV[2])
+end
+redis.call("DEL", KEYS[1])
+return 1
+"""
+
+
+class EntityCache(Generic[ModelType]):
+    """Read-through Redis cache for single model rows.
+
+    Rows are stored as a JSON array of column values in mapper order. The key
+    prefix carries a fingerprint of the cached column names, so entries written
+    before a schema change are never decoded into the wrong attributes.
+
+    Lookups by a unique field go through a pointer key holding the entity ID,
+    which means invalidating the ID key is enough to drop every cached view of
+    a row. Redis errors are logged and treated as cache misses.
+
+    Invalidation also leaves a floor key holding the committed ``version``
+    (``*`` when unknown, e.g. after a delete) for one TTL. ``set`` refuses
+    rows older than the floor, so a read that started before a write, or hit
+    a lagging replica, cannot put the old row back after the invalidation.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        model: Type[ModelType],
+        ttl: int,
+        lookup_fields: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+    ):
+        self.redis = redis_client
+        self.model = model
+        self.ttl = ttl
+        self.lookup_fields = frozenset(lookup_fields)
+        excluded = set(exclude)
+        self._columns = [
+            (attr.key, attr.columns[0].type)
+            for attr in inspect(model).column_attrs
+            if attr.key not in excluded
+        ]
+        fingerprint = hashlib.sha1(
+            ",".join(key for key, _ in self._columns).encode()
+        ).hexdigest()[:8]
+        self._prefix = f"cache:{model.__tablename__}:{fingerprint}"
+
+    def _id_key(self, entity_id: Any) -> str:
+        return f"{self._prefix}:id:{entity_id}"
+
+    def _floor_key(self, entity_id: Any) -> str:
+        return f"{self._prefix}:floor:{entity_id}"
+
+    def _field_key(self, field_name: str, value: Any) -> str:
+        return f"{self._prefix}:{field_name}:{value}"
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _decode_value(column_type, value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            python_type = column_type.python_type
+        except NotImplementedError:
+            return value
+        if python_type is uuid.UUID:
+            return uuid.UUID(value)
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return value
+
+    def _dumps(self, entity: ModelType) -> str:
+        return json.dumps(
+            [self._encode_value(getattr(entity, key)) for key, _ in self._columns],
+            separators=(",", ":"),
+        )
+
+    def _loads(self, raw: str) -> ModelType:
+        values = json.loads(raw)
+        return self.model(
+            **{
+                key: self._decode_value(column_type, value)
+                for (key, column_type), value in zip(self._columns, values)
+            }
+        )
+
+    async def get(self, entity_id: Any) -> Optional[ModelType]:
+        try:
+            raw = await self.redis.get(self._id_key(entity_id))
+        except RedisError as exc:
+            logger.warning("Entity cache read failed: {error}", error=exc)
+            return None
+        return self._loads(raw) if raw is not None else None
+
+    async def get_value(self, entity_id: Any, field_name: str) -> Optional[Any]:
+        """Return one cached column without building the entity."""
+        try:
+            raw = await self.redis.get(self._id_key(entity_id))
+        except RedisError as exc:
+            logger.warning("Entity cache read failed: {error}", error=exc)
+            return None
+        if raw is None:
+            return None
+        for (key, column_type), value in zip(self._columns, json.loads(raw)):
+            if key == field_name:
+                return self._decode_value(column_type, value)
+        return None
+
+    async def get_by_field(self, field_name: str, value: Any) -> Optional[ModelType]:
+        try:
+            entity_id = await self.redis.get(self._field_key(field_name, value))
+        except RedisError as exc:
+            logger.warning("Entity cache read failed: {error}", error=exc)
+            return None
+        if entity_id is None:
+            return None
+        entity = await self.get(entity_id)
+        # The pointer outlives the row entry, so make sure it still matches
+        if entity is None or getattr(entity, field_name) != value:
+            return None
+        return entity
+
+    async def set(self, entity: ModelType, field_name: Optional[str] = None):
+        keys = [self._id_key(entity.id), self._floor_key(entity.id)]
+        args = [self._dumps(entity), getattr(entity, "version", 0), self.ttl]
+        if field_name is not None:
+            keys.append(self._field_key(field_name, getattr(entity, field_name)))
+            args.append(str(entity.id))
+        try:
+            await self.redis.register_script(SET_SCRIPT)(keys=keys, args=args)
+        except RedisError as exc:
+            logger.warning("Entity cache write failed: {error}", error=exc)
+
+    async def invalidate(self, entity_id: Any, version: Optional[int] = None):
+        """Drop the cached row; ``version`` is the one just committed, if known."""
+        try:
+            await self.redis.register_script(INVALIDATE_SCRIPT)(
+                keys=[self._id_key(entity_id), self._floor_key(entity_id)],
+                args=["*" if version is None else version, self.ttl],
+            )
+        except RedisError as exc:
+            logger.warning("Entity cache invalidation failed: {error}", error=exc)
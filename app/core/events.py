@@ -0,0 +1,66 @@
+"""Change event transport.
+
+Events are JSON documents published per model on ``<model>-events``
+(``user-events``, ``group-events``, ``role-events``). ``EVENT_BACKEND``
+selects how they are delivered:
+
+* ``pubsub`` (default): fire-and-forget ``PUBLISH`` on the channel.
+* ``streams``: ``XADD`` to a stream of the same name, with the JSON document
+  in the ``event`` field and the stream trimmed to roughly
+  ``EVENT_STREAM_MAXLEN`` entries.
+
+With streams, consumers should read through a consumer group so events
+delivered while they are down are picked up on restart::
+
+    XGROUP CREATE user-events meeting-service $ MKSTREAM
+    XREADGROUP GROUP meeting-service worker-1 COUNT 100 BLOCK 5000 STREAMS user-events >
+    XACK user-events meeting-service <id> [<id> ...]
+
+A consumer whose group has fallen behind the trimmed history can catch up
+with ``GET /events/{model}?after=<last seen id>`` instead of re-scanning
+``GET /users/``.
+"""
+
+from typing import Iterable, Optional
+
+from app.core.settings import settings
+
+
+def _use_streams() -> bool:
+    return settings.EVENT_BACKEND == "streams"
+
+
+def _xadd(client, stream: str, message: str):
+    return client.xadd(
+        stream,
+        {"event": message},
+        maxlen=settings.EVENT_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def publish(redis_client, channel: str, message: str):
+    if _use_streams():
+        await _xadd(redis_client, channel, message)
+    else:
+        await redis_client.publish(channel, message)
+
+
+async def publish_many(redis_client, messages: Iterable[tuple[str, str]]):
+    """Publish ``(channel, message)`` pairs in a single pipelined round trip."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for channel, message in messages:
+            if _use_streams():
+                _xadd(pipe, channel, message)
+            else:
+                pipe.publish(channel, message)
+        await pipe.execute()
+
+
+async def read_stream(
+    redis_client, stream: str, after: Optional[str], count: int
+) -> list[tuple[str, str]]:
+    """Return up to ``count`` ``(id, message)`` entries newer than ``after``."""
+    start = f"({after}" if after else "-"
+    entries = await redis_client.xrange(stream, min=start, max="+", count=count)
+    return [(entry_id, fields["event"]) for entry_id, fields in entries]
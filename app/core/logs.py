@@ -0,0 +1,141 @@
+"""Logging setup.
+
+Log calls use loguru's brace formatting with arguments rather than
+f-strings, e.g. ``logger.info("Fetched user {user_id}", user_id=user_id)``,
+so keyword arguments end up in ``extra`` for JSON output. loguru formats a
+message before handler filters run: only records below the lowest configured
+level are discarded unformatted. Records dropped by a stricter per-module
+level are formatted first, so keep such modules off hot paths.
+
+High-volume success messages go through ``sampled_logger`` instead, which
+makes the per-module and ``LOG_SAMPLE_RATE`` decisions before calling loguru;
+a discarded call never builds a record or formats its message. Warnings and
+errors are never sampled. The sink is enqueued, so writing happens on a
+background thread instead of blocking the event loop.
+"""
+
+import random
+import sys
+from typing import Optional
+
+from loguru import logger
+
+from app.core.settings import settings
+
+
+def parse_levels(spec: str) -> dict[str, str]:
+    """Parse ``"module=LEVEL,..."`` into a mapping of module prefix to level."""
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            module, level = item.split("=", 1)
+            levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+class LogFilter:
+    """Applies per-module minimum levels."""
+
+    def __init__(self, default_level: str, levels: dict[str, str], sample_rate: float):
+        self.default_level = logger.level(default_level.upper()).no
+        # Longest prefix first so the most specific module setting wins
+        self.levels = sorted(
+            ((module, logger.level(level).no) for module, level in levels.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.sample_rate = sample_rate
+        self._module_levels: dict[str, int] = {}
+
+    @property
+    def min_level(self) -> int:
+        return min([self.default_level, *(level for _, level in self.levels)])
+
+    def _level_for(self, name: str) -> int:
+        level = self._module_levels.get(name)
+        if level is None:
+            level = next(
+                (
+                    module_level
+                    for module, module_level in self.levels
+                    if name == module or name.startswith(f"{module}.")
+                ),
+                self.default_level,
+            )
+            self._module_levels[name] = level
+        return level
+
+    def allows(self, level_no: int, name: str) -> bool:
+        return level_no >= self._level_for(name)
+
+    def __call__(self, record) -> bool:
+        return self.allows(record["level"].no, record["name"] or "")
+
+
+class SampledLogger:
+    """Logger for high-volume success messages.
+
+    ``trace``, ``debug`` and ``info`` calls are only handed to
+    loguru if the calling module's level allows them and they win the
+    ``sample_rate`` draw of ``log_filter``. Without a filter every call is
+    passed through.
+    """
+
+    _levels = {
+        name: logger.level(name).no
+        for name in ("TRACE", "DEBUG", "INFO", "WARNING", "ERROR")
+    }
+
+    def __init__(self, log_filter: Optional[LogFilter] = None):
+        self.log_filter = log_filter
+
+    def _log(self, level: str, sampled: bool, message: str, *args, **kwargs):
+        log_filter = self.log_filter
+        if log_filter is not None:
+            # The caller of trace(), info() and so on, two frames up
+            name = sys._getframe(2).f_globals.get(  # pylint: disable=protected-access
+                "__name__", ""
+            )
+            if not log_filter.allows(self._levels[level], name):
+                return
+            if sampled and random.random() >= log_filter.sample_rate:
+                return
+        logger.opt(depth=2).log(level, message, *args, **kwargs)
+
+    def trace(self, message: str, *args, **kwargs):
+        self._log("TRACE", True, message, *args, **kwargs)
+
+    def debug(self, message: str, *args, **kwargs):
+        self._log("DEBUG", True, message, *args, **kwargs)
+
+    def info(self, message: str, *args, **kwargs):
+        self._log("INFO", True, message, *args, **kwargs)
+
+    def warning(self, message: str, *args, **kwargs):
+        self._log("WARNING", False, message, *args, **kwargs)
+
+    def error(self, message: str, *args, **kwargs):
+        self._log("ERROR", False, message, *args, **kwargs)
+
+
+sampled_logger = SampledLogger()
+
+
+def configure_logging():
+    """Replace loguru's default handler with the configured one."""
+    log_filter = LogFilter(
+        settings.LOG_LEVEL,
+        parse_levels(settings.LOG_LEVELS),
+        settings.LOG_SAMPLE_RATE,
+    )
+    sampled_logger.log_filter = log_filter
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=log_filter.min_level,
+        filter=log_filter,
+        enqueue=settings.LOG_ENQUEUE,
+        serialize=settings.LOG_JSON,
+        backtrace=False,
+        diagnose=False,
+    )
@@ -0,0 +1,85 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# HTTP requests, labelled with the route template rather than the raw path
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests currently being handled", ["method", "route"]
+)
+
+# Password hashing
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password operations submitted to the hashing pool and not yet completed",
+)
+PASSWORD_HASH_WAITING = Gauge(
+    "password_hash_waiting",
+    "Password operations waiting for room in the hashing pool queue",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "Password operations refused because the hashing pool was saturated",
+    ["operation", "reason"],
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password in the hashing pool",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+
+# Authentication rate limiting
+AUTH_RATE_LIMITED = Counter(
+    "auth_rate_limited", "Authentication attempts rejected with a 429", ["endpoint"]
+)
+
+# Decoded JWT cache
+JWT_CACHE_HITS = Counter("jwt_cache_hits", "Access tokens served from the JWT cache")
+JWT_CACHE_MISSES = Counter(
+    "jwt_cache_misses", "Access tokens that required full JWT verification"
+)
+
+# Database connection pool
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ["pool"]
+)
+DB_POOL_SATURATION = Gauge(
+    "db_pool_saturation",
+    "Checked out connections as a fraction of pool size plus overflow",
+    ["pool"],
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Time spent executing a SQL statement, by statement type",
+    ["pool", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# Change events
+EVENT_PUBLISH_DURATION = Histogram(
+    "event_publish_duration_seconds",
+    "Time spent publishing change events to Redis",
+    ["channel"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+EVENT_PUBLISH_FAILURES = Counter(
+    "event_publish_failures", "Change event publishes that raised", ["channel"]
+)
+
+# Single-flight reads
+SINGLE_FLIGHT_SHARED = Counter(
+    "single_flight_shared",
+    "Reads answered by joining an identical read already in flight",
+    ["model"],
+)
@@ -0,0 +1,119 @@
+"""Token buckets kept in Redis for the authentication endpoints.
+
+Each bucket is a hash of its remaining ``tokens`` and the time ``ts`` they
+were counted at; refills are computed lazily on the next request. One Lua
+script checks every bucket a request draws from and takes a token from each
+only if all of them have one, so a refused request costs nothing and
+concurrent app workers never overdraw a bucket.
+"""
+
+import hashlib
+import math
+import time
+from typing import Optional
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.core.metrics import AUTH_RATE_LIMITED
+from app.exceptions import TooManyRequestsError
+
+# KEYS: bucket keys; ARGV: now, then capacity and refill per second per key.
+# Returns the seconds until every bucket has a token again, "0" if taken.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call("HMGET", key, "tokens", "ts")
+    local available = tonumber(bucket[1]) or capacity
+    local elapsed = math.max(0, now - (tonumber(bucket[2]) or now))
+    available = math.min(capacity, available + elapsed * rate)
+    if available < 1 then
+        wait = math.max(wait, (1 - available) / rate)
+    end
+    tokens[i] = available
+end
+if wait == 0 then
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2])
+        local rate = tonumber(ARGV[i * 2 + 1])
+        redis.call("HSET", key, "tokens", tostring(tokens[i] - 1), "ts", tostring(now))
+        redis.call("PEXPIRE", key, math.ceil(capacity / rate * 1000))
+    end
+end
+return tostring(wait)
+"""
+
+
+class Bucket:
+    """Capacity and refill rate of one kind of bucket."""
+
+    def __init__(self, name: str, capacity: int, per_minute: float):
+        self.name = name
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+
+class AuthRateLimiter:
+    """Limits authentication attempts per email and per client address.
+
+    Emails are hashed before they become part of a key. If Redis cannot be
+    reached the attempt is let through: the hashing pool's own admission
+    limit still bounds the work, and an outage should not lock users out.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        email_bucket: Bucket,
+        client_bucket: Bucket,
+        enabled: bool = True,
+        prefix: str = "rate:auth",
+    ):
+        self.redis_client = redis_client
+        self.email_bucket = email_bucket
+        self.client_bucket = client_bucket
+        self.enabled = enabled
+        self.prefix = prefix
+
+    def _key(self, endpoint: str, bucket: Bucket, value: str) -> str:
+        digest = hashlib.sha256(value.encode()).hexdigest()[:32]
+        return f"{self.prefix}:{endpoint}:{bucket.name}:{digest}"
+
+    async def check(
+        self,
+        endpoint: str,
+        client: Optional[str],
+        email: str,
+        now: Optional[float] = None,
+    ):
+        """Take a token for ``email`` and ``client`` or raise a 429."""
+        if not self.enabled:
+            return
+        buckets = [(self.email_bucket, email.strip().lower())]
+        if client:
+            buckets.append((self.client_bucket, client))
+        args = [now if now is not None else time.time()]
+        for bucket, _ in buckets:
+            args.extend((bucket.capacity, bucket.rate))
+        try:
+            script = self.redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+            wait = float(
+                await script(
+                    keys=[
+                        self._key(endpoint, bucket, value) for bucket, value in buckets
+                    ],
+                    args=args,
+                )
+            )
+        except RedisError as exc:
+            logger.warning("Rate limit check failed: {error}", error=exc)
+            return
+        if wait > 0:
+            AUTH_RATE_LIMITED.labels(endpoint).inc()
+            raise TooManyRequestsError(
+                "Too many attempts, try again later", retry_after=math.ceil(wait)
+            )
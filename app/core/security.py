@@ -1,5 +1,10 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+import hashlib
+import time
+from typing import Any, Callable, Optional
 from uuid import UUID
 
 from fastapi.security import OAuth2PasswordBearer
@@ -7,7 +12,16 @@ from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 from passlib.context import CryptContext
 
+from app.core.metrics import (
+    JWT_CACHE_HITS,
+    JWT_CACHE_MISSES,
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_REJECTED,
+    PASSWORD_HASH_WAITING,
+)
 from app.core.settings import settings
+from app.exceptions import ServiceUnavailableError
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
@@ -24,6 +38,152 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+# Pool sizes and admission limits are kept as plain attributes, like settings
+class PasswordHasher:  # pylint: disable=too-many-instance-attributes
+    """Runs bcrypt hashing and verification in a bounded worker pool.
+
+    At most ``capacity`` (``max_workers + queue_size``) operations are handed
+    to the pool at once. Further callers wait on the event loop until a slot
+    frees up, but only ``max_waiting`` of them and for at most
+    ``wait_timeout`` seconds; past either limit the operation is refused with
+    ``ServiceUnavailableError`` so a burst of logins cannot pile up unbounded
+    work. ``None`` leaves the corresponding limit off. Callers that pass
+    ``shed=False`` wait for a slot without either limit and are not counted
+    as waiting.
+    """
+
+    def __init__(
+        self,
+        executor_type: str,
+        max_workers: int,
+        queue_size: int,
+        max_waiting: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+    ):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor_type}")
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_size
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they first wait on, so keep one per loop
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.capacity)
+            self._loop = loop
+            self._waiting = 0
+        return self._slots
+
+    @staticmethod
+    def _reject(operation: str, reason: str):
+        PASSWORD_HASH_REJECTED.labels(operation, reason).inc()
+        raise ServiceUnavailableError("Too many password operations in progress")
+
+    async def _acquire(self, slots: asyncio.Semaphore, operation: str):
+        if (
+            self.max_waiting is not None
+            and slots.locked()
+            and self._waiting >= self.max_waiting
+        ):
+            self._reject(operation, "queue_full")
+        self._waiting += 1
+        PASSWORD_HASH_WAITING.inc()
+        try:
+            await asyncio.wait_for(slots.acquire(), self.wait_timeout)
+        except TimeoutError:
+            self._reject(operation, "timeout")
+        finally:
+            self._waiting -= 1
+            PASSWORD_HASH_WAITING.dec()
+
+    async def run(
+        self, operation: str, func: Callable[..., Any], *args, shed: bool = True
+    ) -> Any:
+        slots = self._get_slots()
+        if shed:
+            await self._acquire(slots, operation)
+        else:
+            await slots.acquire()
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), func, *args
+            )
+        finally:
+            PASSWORD_HASH_DURATION.labels(operation).observe(
+                time.perf_counter() - start
+            )
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+            slots.release()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    max_waiting=settings.PASSWORD_HASH_MAX_WAITING,
+    wait_timeout=settings.PASSWORD_HASH_WAIT_TIMEOUT or None,
+)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await password_hasher.run(
+        "verify", verify_password, plain_password, hashed_password
+    )
+
+
+async def hash_password_async(password, shed: bool = True) -> str:
+    return await password_hasher.run("hash", get_password_hash, password, shed=shed)
+
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """Hash a batch of passwords without ever refusing it.
+
+    Bulk create and import cannot retry a single row, so they wait for slots
+    instead of being shed. Hashing one pool's worth at a time keeps a large
+    batch from queueing thousands of waiters ahead of interactive logins.
+    """
+    hashed_passwords = []
+    step = password_hasher.capacity
+    for start in range(0, len(passwords), step):
+        hashed_passwords.extend(
+            await asyncio.gather(
+                *(
+                    hash_password_async(password, shed=False)
+                    for password in passwords[start : start + step]
+                )
+            )
+        )
+    return hashed_passwords
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
 
@@ -40,11 +200,68 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+class TokenCache:
+    """Bounded LRU cache of validated token payloads.
+
+    Entries are keyed by a SHA-256 digest of the token and dropped once the
+    token's ``exp`` claim has passed, so a cached payload is never served for
+    a token that ``jwt.decode`` would reject as expired.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        if self.max_size <= 0:
+            return None
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            JWT_CACHE_MISSES.inc()
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            JWT_CACHE_MISSES.inc()
+            return None
+        self._entries.move_to_end(key)
+        JWT_CACHE_HITS.inc()
+        return dict(payload)
+
+    def set(self, token: str, payload: dict):
+        expires_at = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (dict(payload), float(expires_at))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(max_size=settings.JWT_CACHE_SIZE)
+
+
 def decode_access_token(token: str) -> dict:
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except ExpiredSignatureError as exc:
         raise ValueError("Token expired") from exc
     except JWTError as exc:
         raise ValueError("Invalid token") from exc
+    token_cache.set(token, payload)
+    return payload
@@ -0,0 +1,83 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Optional, TypeVar
+
+from app.core.metrics import SINGLE_FLIGHT_SHARED
+
+ResultType = TypeVar("ResultType")
+
+
+class _FlightAbandoned(Exception):
+    """The caller running a flight was cancelled before it finished."""
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share it.
+
+    The first caller for a key runs the call itself, and anyone asking for the
+    same key meanwhile awaits its outcome, errors included. Nothing is kept
+    once the call finishes, so a caller never gets a result read before it
+    arrived, except from a flight that was already running: a write committed
+    in the meantime may be missing. Writers call ``forget`` after committing
+    so that later callers start a fresh flight instead. If the running caller
+    is cancelled, one of the waiting callers takes over.
+
+    Waiting callers receive the very object the running caller got, so it
+    must be treated as read-only; ``adopt`` lets them turn it into their own
+    copy first, e.g. to move an ORM entity into their session.
+    """
+
+    def __init__(self):
+        self._flights: dict[tuple, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[ResultType]],
+        label: str = "",
+        adopt: Optional[Callable[[ResultType], Awaitable[ResultType]]] = None,
+    ) -> ResultType:
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        future = self._flights.get(flight_key)
+        if future is not None:
+            SINGLE_FLIGHT_SHARED.labels(label).inc()
+            try:
+                result = await asyncio.shield(future)
+            except _FlightAbandoned:
+                return await self.do(key, func, label, adopt)
+            return await adopt(result) if adopt is not None else result
+
+        future = self._flights[flight_key] = loop.create_future()
+        try:
+            result = await func()
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        except BaseException:
+            future.set_exception(_FlightAbandoned())
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # A forgotten flight may already have been replaced by a new one
+            if self._flights.get(flight_key) is future:
+                del self._flights[flight_key]
+            if future.done() and not future.cancelled():
+                # Mark the outcome as retrieved when nobody was waiting on it
+                future.exception()
+
+    def forget(self, predicate: Callable[[Hashable], bool]):
+        """Let later callers start a new flight for every key matching ``predicate``.
+
+        Running flights finish and answer the callers already waiting on them.
+        """
+        loop = asyncio.get_running_loop()
+        for flight_key in list(self._flights):
+            flight_loop, key = flight_key
+            if flight_loop is loop and predicate(key):
+                del self._flights[flight_key]
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,157 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import re
+import time
+from typing import Any, Iterator, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_SATURATION,
+    DB_QUERY_DURATION,
+)
+from app.core.settings import settings
+
+OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "OTHER")
+_START_TIMES = "query_start_times"
+# Bind parameter markers, and lists of them as rendered for expanding IN
+_PLACEHOLDER = re.compile(r"\$\d+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:::[\w\[\]]+)?(?:,\s*\?(?:::[\w\[\]]+)?)+\)")
+
+
+def register_pool_metrics(engine: AsyncEngine, pool_name: str):
+    pool = engine.sync_engine.pool
+    pool.pool_name = pool_name
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    # Evaluated at scrape time, so the checkout path pays nothing for them
+    DB_POOL_CHECKED_OUT.labels(pool_name).set_function(pool.checkedout)
+    DB_POOL_SATURATION.labels(pool_name).set_function(
+        lambda: pool.checkedout() / capacity
+    )
+
+
+def _operation(statement: str) -> str:
+    words = statement[:16].split(None, 1)
+    verb = words[0].upper() if words else ""
+    return verb if verb in OPERATIONS else "OTHER"
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise bind markers so ``IN`` lists of any length compare equal."""
+    return _PLACEHOLDER_LIST.sub("(?)", _PLACEHOLDER.sub("?", statement))
+
+
+def redact_parameters(parameters: Any) -> str:
+    """Describe bound parameters by type only, never by value."""
+    if isinstance(parameters, dict):
+        return ", ".join(
+            f"{name}=<{type(value).__name__}>" for name, value in parameters.items()
+        )
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f"<{len(parameters)} parameter sets>"
+        return ", ".join(f"<{type(value).__name__}>" for value in parameters)
+    return "<redacted>"
+
+
+class QueryStats:
+    """Statements run while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._statements: dict[str, int] = {}
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self._statements[statement] = self._statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes that ran more than ``threshold`` times."""
+        shapes: dict[str, int] = {}
+        for statement, count in self._statements.items():
+            shape = statement_shape(statement)
+            shapes[shape] = shapes.get(shape, 0) + count
+        return [(shape, count) for shape, count in shapes.items() if count > threshold]
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements run in the current context into a ``QueryStats``.
+
+    SQLAlchemy runs engine events in a greenlet sharing the calling task's
+    context, so queries issued while the block is active are recorded.
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def instrument_queries(engine: AsyncEngine, pool_name: str = "primary"):
+    """Time every statement run on ``engine``.
+
+    Durations feed the ``db_query_duration_seconds`` histogram when metrics
+    are enabled and the active ``QueryStats``, if any. With
+    ``QUERY_STATS_ENABLED``, statements slower than ``SLOW_QUERY_MS`` are
+    logged with their parameters redacted.
+
+    Start times are kept on the connection's ``info`` so nested executions on
+    one connection stay paired; the histogram children are bound up front to
+    keep label lookups off the query path.
+    """
+    durations = (
+        {
+            operation: DB_QUERY_DURATION.labels(pool_name, operation)
+            for operation in OPERATIONS
+        }
+        if settings.METRICS_ENABLED
+        else None
+    )
+    slow_query_seconds = (
+        settings.SLOW_QUERY_MS / 1000 if settings.QUERY_STATS_ENABLED else 0
+    )
+
+    def _record(statement: str, parameters: Any, start: float):
+        elapsed = time.perf_counter() - start
+        if durations is not None:
+            durations[_operation(statement)].observe(elapsed)
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if slow_query_seconds and elapsed >= slow_query_seconds:
+            logger.warning(
+                "Slow query on {pool} ({duration_ms:.1f} ms): {statement} "
+                "[parameters: {parameters}]",
+                pool=pool_name,
+                duration_ms=elapsed * 1000,
+                statement=statement,
+                parameters=redact_parameters(parameters),
+            )
+
+    def _before(conn, *_args):
+        conn.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+    def _after(conn, _cursor, statement, parameters, *_args):
+        _record(statement, parameters, conn.info[_START_TIMES].pop())
+
+    def _error(context):
+        start_times = (
+            context.connection.info.get(_START_TIMES) if context.connection else None
+        )
+        if start_times:
+            _record(context.statement or "", context.parameters, start_times.pop())
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before)
+    event.listen(sync_engine, "after_cursor_execute", _after)
+    event.listen(sync_engine, "handle_error", _error)
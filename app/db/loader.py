@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Generic, Optional, Type, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.db.repositories.base_repo import match_any
+
+ModelType = TypeVar("ModelType")
+
+
+async def adopt(session: AsyncSession, entity: Optional[ModelType]):
+    """Return ``entity`` as an instance belonging to ``session``.
+
+    Entities shared between concurrent lookups were loaded on another
+    request's session, or decoded from the cache into none. A copy of the
+    loaded columns is merged into ``session`` without a query, so callers
+    never touch another session's transaction or lazy relationships. Shared
+    entities are read-only: what the copy holds is what the leader had loaded.
+    """
+    if entity is None:
+        return None
+    state = inspect(entity)
+    if state.session is session.sync_session:
+        return entity
+    copy = type(entity)()
+    for attr in state.mapper.column_attrs:
+        if attr.key in state.dict:
+            setattr(copy, attr.key, state.dict[attr.key])
+    make_transient_to_detached(copy)
+    return await session.merge(copy, load=False)
+
+
+class _LeaderFailed(Exception):
+    """The coroutine running a batch went away before loading it."""
+
+
+class BatchLoader(Generic[ModelType]):
+    """Coalesces concurrent lookups of one unique column into a single query.
+
+    The first caller in an event-loop tick becomes the leader: it yields once
+    so that other lookups scheduled in the same tick can join its batch, then
+    loads every requested key with one ``IN``/``= ANY`` query on its own session and
+    hands the rows to the waiting callers. Batches are kept apart per
+    database bind, so primary and replica lookups are never mixed. The query
+    runs in the leader's transaction and counts towards its query stats;
+    the other callers get copies merged into their own session (see ``adopt``).
+
+    If the leader is cancelled or fails, the remaining callers fall back to
+    loading their key themselves.
+    """
+
+    def __init__(self, model: Type[ModelType], field_name: str, max_batch_size: int):
+        self.model = model
+        self.field_name = field_name
+        self.max_batch_size = max_batch_size
+        # Open batches per (event loop, bind): requested key -> result future
+        self._pending: dict[tuple, dict[Any, asyncio.Future]] = {}
+
+    async def _fetch(self, session: AsyncSession, keys: list) -> dict[Any, ModelType]:
+        condition = match_any(
+            getattr(self.model, self.field_name),
+            keys,
+            session.get_bind().dialect.name,
+        )
+        stmt = select(self.model).filter(condition)
+        result = await session.execute(stmt)
+        return {
+            getattr(entity, self.field_name): entity
+            for entity in result.unique().scalars().all()
+        }
+
+    async def load(self, session: AsyncSession, key: Any) -> Optional[ModelType]:
+        loop = asyncio.get_running_loop()
+        batch_key = (loop, session.bind)
+        batch = self._pending.get(batch_key)
+        if batch is not None and len(batch) < self.max_batch_size:
+            future = batch.get(key)
+            if future is None:
+                future = batch[key] = loop.create_future()
+            try:
+                return await adopt(session, await asyncio.shield(future))
+            except _LeaderFailed:
+                return (await self._fetch(session, [key])).get(key)
+
+        batch = self._pending[batch_key] = {}
+        own_future = batch[key] = loop.create_future()
+        try:
+            await asyncio.sleep(0)
+            if self._pending.get(batch_key) is batch:
+                del self._pending[batch_key]
+            entities = await self._fetch(session, list(batch))
+        except BaseException:
+            if self._pending.get(batch_key) is batch:
+                del self._pending[batch_key]
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(_LeaderFailed())
+            # Followers sharing the leader's key observe it; nobody else will
+            own_future.exception()
+            raise
+        for requested_key, future in batch.items():
+            future.set_result(entities.get(requested_key))
+        return own_future.result()
+
+
+_loaders: dict[tuple, BatchLoader] = {}
+
+
+def get_loader(model: Type[ModelType], field_name: str, max_batch_size: int):
+    """Return the process-wide loader for ``model.field_name``."""
+    loader_key = (model, field_name)
+    if loader_key not in _loaders:
+        _loaders[loader_key] = BatchLoader(model, field_name, max_batch_size)
+    return _loaders[loader_key]
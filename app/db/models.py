@@ -1,6 +1,18 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Table
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -41,15 +53,25 @@ group_users = Table(
 
 class User(Base):
     __tablename__ = "users"
-    __table_args__ = (Index("ix_user_email", "email"),)
+    __table_args__ = (
+        # Covers the login lookup, so it is answered by an index-only scan
+        Index(
+            "ix_users_email",
+            "email",
+            unique=True,
+            postgresql_include=["id", "hashed_password", "is_active"],
+        ),
+    )
 
     id = id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, nullable=False)
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    # Bumped on every update; exposed to clients as the ETag
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     roles = relationship("Role", secondary=user_roles, back_populates="users")
@@ -62,6 +84,7 @@ class Role(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), unique=True, nullable=False)
     description = Column(String, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     users = relationship("User", secondary="user_roles", back_populates="roles")
 
@@ -72,5 +95,22 @@ class Group(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), unique=True, nullable=False)
     description = Column(String, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     users = relationship("User", secondary="group_users", back_populates="groups")
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox"
+
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    channel = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -1,52 +1,331 @@
-from typing import Any, Generic, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Generic,
+    Iterable,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
+from sqlalchemy import Row, any_, delete, literal, text, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 ModelType = TypeVar("ModelType")
 
 
+def match_any(column, values: list, dialect_name: str):
+    """``column IN values``, rendered as ``= ANY(array)`` on PostgreSQL.
+
+    A single array parameter keeps the statement text the same for every
+    list length, so asyncpg can reuse one prepared statement.
+    """
+    if dialect_name == "postgresql":
+        return column == any_(literal(values, postgresql.ARRAY(column.type)))
+    return column.in_(values)
+
+
 class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType], db: AsyncSession):
         self.model = model
         self.db = db
 
-    async def create(self, obj_in: dict) -> ModelType:
+    async def commit(self):
+        await self.db.commit()
+
+    async def rollback(self):
+        await self.db.rollback()
+
+    async def _flush_or_commit(self, commit: bool):
+        # With commit=False the caller finishes the transaction, e.g. after
+        # staging outbox events alongside the change
+        if commit:
+            await self.db.commit()
+        else:
+            await self.db.flush()
+
+    async def create(self, obj_in: dict, commit: bool = True) -> ModelType:
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
-        await self.db.commit()
+        await self._flush_or_commit(commit)
         await self.db.refresh(db_obj)
         return db_obj
 
+    def _insert(self):
+        """Return a dialect-specific INSERT so ON CONFLICT clauses are available."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(self.model)
+        if dialect == "sqlite":
+            return sqlite.insert(self.model)
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+
+    async def create_if_absent(
+        self, obj_in: dict, conflict_field: str, commit: bool = True
+    ) -> Optional[ModelType]:
+        """Insert a row unless ``conflict_field`` already holds its value.
+
+        Runs a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING``, so the
+        uniqueness check cannot race with a concurrent insert and the created
+        entity comes back without a second SELECT. Returns ``None`` on conflict.
+        """
+        stmt = (
+            self._insert()
+            .values(**obj_in)
+            .on_conflict_do_nothing(index_elements=[conflict_field])
+            .returning(self.model)
+        )
+        entity = await self.db.scalar(stmt)
+        if entity is not None and commit:
+            await self.db.commit()
+        return entity
+
+    async def create_many(
+        self, objs_in: list[dict], conflict_field: str, commit: bool = True
+    ) -> list[ModelType]:
+        """Insert many rows in one transaction, skipping conflicting ones.
+
+        Rows are sent as multi-row ``INSERT ... ON CONFLICT DO NOTHING
+        RETURNING`` statements (batched by SQLAlchemy's insertmanyvalues), so
+        only the rows that were actually inserted are returned.
+        """
+        if not objs_in:
+            return []
+        stmt = (
+            self._insert()
+            .on_conflict_do_nothing(index_elements=[conflict_field])
+            .returning(self.model)
+        )
+        result = await self.db.scalars(stmt, objs_in)
+        entities = result.all()
+        if commit:
+            await self.db.commit()
+        return entities
+
+    def _with_defaults(self, obj_in: dict) -> dict:
+        """Fill in client-side column defaults (e.g. generated UUID keys)."""
+        row = dict(obj_in)
+        for column in self.model.__table__.columns:
+            if column.key in row or column.default is None:
+                continue
+            if column.default.is_callable:
+                row[column.key] = column.default.arg(None)
+            elif column.default.is_scalar:
+                row[column.key] = column.default.arg
+        return row
+
+    async def copy_many(
+        self, objs_in: list[dict], conflict_field: str, commit: bool = True
+    ) -> list[tuple[Any, Any]]:
+        """Load rows with ``COPY`` into a staging table and merge them.
+
+        The rows are copied into a session-local temporary table and merged
+        with ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``, which avoids
+        per-row statement overhead for large loads. Returns ``(conflict value,
+        id)`` pairs for the inserted rows. Drivers without ``COPY`` support
+        fall back to ``create_many``.
+        """
+        if not objs_in:
+            return []
+        if self.db.get_bind().dialect.driver != "asyncpg":
+            entities = await self.create_many(objs_in, conflict_field, commit=commit)
+            return [(getattr(entity, conflict_field), entity.id) for entity in entities]
+
+        rows = [self._with_defaults(obj_in) for obj_in in objs_in]
+        columns = list(rows[0])
+        quote = self.db.get_bind().dialect.identifier_preparer.quote
+        table = quote(self.model.__tablename__)
+        staging = quote(f"{self.model.__tablename__}_import")
+        column_list = ", ".join(quote(column) for column in columns)
+
+        await self.db.execute(
+            text(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+        )
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            f"{self.model.__tablename__}_import",
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+        result = await self.db.execute(
+            text(
+                f"INSERT INTO {table} ({column_list}) "
+                f"SELECT {column_list} FROM {staging} "
+                f"ON CONFLICT ({quote(conflict_field)}) DO NOTHING "
+                f"RETURNING {quote(conflict_field)}, id"
+            )
+        )
+        inserted = [tuple(row) for row in result.all()]
+        # Clear the staging table in case more batches share this transaction
+        await self.db.execute(text(f"TRUNCATE {staging}"))
+        await self._flush_or_commit(commit)
+        return inserted
+
     async def get_by_id(self, entity_id: int) -> ModelType:
         stmt = select(self.model).filter(self.model.id == entity_id)
         result = await self.db.execute(stmt)
         return result.unique().scalar()
 
-    async def get_all(self, skip: int = 0, limit: int = 10) -> list[ModelType]:
-        stmt = select(self.model).offset(skip).limit(limit)
-        result = await self.db.execute(stmt)
+    async def get_page(
+        self, after: Optional[Any] = None, limit: int = 10
+    ) -> tuple[list[ModelType], bool]:
+        """Return up to ``limit`` entities with an ID greater than ``after``.
+
+        Uses keyset pagination on the primary key, so every page costs the same
+        index range scan no matter how deep into the table it is. The second
+        element of the result tells whether more rows follow.
+        """
+        result = await self.db.execute(self._page_statement([self.model], after, limit))
+        entities = result.unique().scalars().all()
+        return entities[:limit], len(entities) > limit
+
+    async def get_page_rows(
+        self, field_names: Sequence[str], after: Optional[Any] = None, limit: int = 10
+    ) -> tuple[list[Row], bool]:
+        """Like ``get_page`` but returns plain rows of the given columns.
+
+        Skips ORM identity-map bookkeeping, which dominates for large pages.
+        ``field_names`` must include ``id``.
+        """
+        columns = [getattr(self.model, name) for name in field_names]
+        result = await self.db.execute(self._page_statement(columns, after, limit))
+        rows = result.all()
+        return rows[:limit], len(rows) > limit
+
+    def _page_statement(self, columns: list, after: Optional[Any], limit: int):
+        stmt = select(*columns).order_by(self.model.id).limit(limit + 1)
+        if after is not None:
+            stmt = stmt.filter(self.model.id > after)
+        return stmt
+
+    async def stream_columns(
+        self, field_names: Iterable[str], batch_size: int, **filters: Any
+    ) -> AsyncIterator[list[Row]]:
+        """Yield rows of the given columns in batches of up to ``batch_size``.
+
+        Rows come from a server-side cursor, so only one batch is held in
+        memory at a time. ``filters`` are equality conditions on model columns.
+        """
+        stmt = (
+            select(*(getattr(self.model, name) for name in field_names))
+            .filter_by(**filters)
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_many(self, field_name: str, values: list) -> list[ModelType]:
+        """Return the entities whose ``field_name`` is one of ``values``."""
+        if not values:
+            return []
+        condition = match_any(
+            getattr(self.model, field_name),
+            list(values),
+            self.db.get_bind().dialect.name,
+        )
+        result = await self.db.execute(select(self.model).filter(condition))
         return result.unique().scalars().all()
 
+    async def get_existing_values(self, field_name: str, values: list) -> set:
+        """Return the subset of ``values`` already stored in ``field_name``."""
+        if not values:
+            return set()
+        column = getattr(self.model, field_name)
+        stmt = select(column).filter(column.in_(set(values)))
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+
     async def get_by_field(self, field_name: str, value: Any) -> list[ModelType]:
         stmt = select(self.model).filter(getattr(self.model, field_name) == value)
         result = await self.db.execute(stmt)
         return result.unique().scalars().all()
 
-    async def update(self, entity_id: int, update_data: dict) -> ModelType:
+    def _version_bump(self) -> dict:
+        """Values that advance the row version, for models that have one."""
+        if hasattr(self.model, "version"):
+            return {"version": self.model.version + 1}
+        return {}
+
+    async def get_version(self, entity_id: Any) -> Optional[int]:
+        """Return the row version without loading the entity."""
+        stmt = select(self.model.version).filter(self.model.id == entity_id)
+        return await self.db.scalar(stmt)
+
+    async def update(
+        self, entity_id: int, update_data: dict, commit: bool = True
+    ) -> ModelType:
         obj = await self.get_by_id(entity_id)
         if not obj:
             return None
-        for key, value in update_data.items():
+        for key, value in {**update_data, **self._version_bump()}.items():
             setattr(obj, key, value)
-        await self.db.commit()
+        await self._flush_or_commit(commit)
         await self.db.refresh(obj)
         return obj
 
-    async def delete(self, entity_id: int) -> bool:
+    async def update_returning(
+        self,
+        entity_id: Any,
+        update_data: dict,
+        commit: bool = True,
+        expected_versions: Optional[Iterable[int]] = None,
+    ) -> Optional[ModelType]:
+        """Update a row with one ``UPDATE ... RETURNING`` statement.
+
+        With ``expected_versions`` the row is only updated while its version
+        is one of them, which gives optimistic concurrency without locks.
+        Returns the updated entity, or ``None`` if no row matched.
+        An instance already in the session is refreshed with the new values.
+        """
+        if not update_data:
+            entity = await self.get_by_id(entity_id)
+            if entity is None or expected_versions is None:
+                return entity
+            return entity if entity.version in set(expected_versions) else None
+        stmt = (
+            update(self.model)
+            .where(self.model.id == entity_id)
+            .values(**update_data, **self._version_bump())
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        if expected_versions is not None:
+            stmt = stmt.where(self.model.version.in_(list(expected_versions)))
+        entity = await self.db.scalar(stmt)
+        if entity is not None:
+            await self._flush_or_commit(commit)
+        return entity
+
+    async def delete_returning(self, entity_id: Any, commit: bool = True) -> bool:
+        """Delete a row with one ``DELETE ... RETURNING`` statement.
+
+        Association rows go with it through the ``ON DELETE CASCADE`` foreign
+        keys rather than ORM cascades. Returns whether a row was deleted.
+        """
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == entity_id)
+            .returning(self.model.id)
+        )
+        deleted_id = await self.db.scalar(stmt)
+        if deleted_id is None:
+            return False
+        await self._flush_or_commit(commit)
+        return True
+
+    async def delete(self, entity_id: int, commit: bool = True) -> bool:
         obj = await self.get_by_id(entity_id)
         if obj:
             await self.db.delete(obj)
-            await self.db.commit()
+            await self._flush_or_commit(commit)
             return True
         return False
@@ -0,0 +1,41 @@
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models import OutboxEvent
+
+
+class OutboxRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def add_events(self, channel: str, payloads: list[str]):
+        """Stage events on the session; they are written with its next commit."""
+        self.db.add_all(
+            [OutboxEvent(channel=channel, payload=payload) for payload in payloads]
+        )
+
+    async def get_batch(self, limit: int) -> list[OutboxEvent]:
+        """Lock and return the oldest pending events.
+
+        Rows locked by another relay are skipped, so several workers can drain
+        the outbox concurrently without publishing an event twice.
+        """
+        stmt = (
+            select(OutboxEvent)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def delete_events(self, event_ids: list[int]):
+        await self.db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids)))
+
+    async def record_failure(self, event_ids: list[int]):
+        await self.db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(attempts=OutboxEvent.attempts + 1)
+        )
@@ -1,7 +1,10 @@
+from typing import Optional
+
+from sqlalchemy import Row, literal, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.db.models import User
+from app.db.models import Group, Role, User, group_users, user_roles
 from app.db.repositories.base_repo import BaseRepository
 
 
@@ -21,6 +24,18 @@ class UserRepository(BaseRepository[User]):
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
+    async def get_credentials(self, email: str) -> Optional[Row]:
+        """Load only the columns needed to authenticate a user.
+
+        Returns a row with ``id``, ``email``, ``hashed_password`` and
+        ``is_active``, all of which are covered by ``ix_users_email``.
+        """
+        stmt = select(User.id, User.email, User.hashed_password, User.is_active).where(
+            User.email == email
+        )
+        result = await self.db.execute(stmt)
+        return result.first()
+
     async def get_user_by_id(self, user_id: int) -> User:
         stmt = select(User).where(User.id == user_id)
         result = await self.db.execute(stmt)
@@ -30,3 +45,19 @@ class UserRepository(BaseRepository[User]):
         stmt = select(User)
         result = await self.db.execute(stmt)
         return result.scalars().all()
+
+    async def get_role_and_group_names(self, user_id) -> tuple[list[str], list[str]]:
+        """Load the user's role and group names in a single round trip."""
+        stmt = union_all(
+            select(literal("role").label("kind"), Role.name)
+            .join(user_roles, user_roles.c.role_id == Role.id)
+            .where(user_roles.c.user_id == user_id),
+            select(literal("group").label("kind"), Group.name)
+            .join(group_users, group_users.c.group_id == Group.id)
+            .where(group_users.c.user_id == user_id),
+        )
+        result = await self.db.execute(stmt)
+        roles, groups = [], []
+        for kind, name in result.all():
+            (roles if kind == "role" else groups).append(name)
+        return sorted(roles), sorted(groups)
@@ -0,0 +1,44 @@
+import hashlib
+import time
+
+
+def client_key(scope: dict) -> bytes:
+    """Identify a client by its bearer token, falling back to its address."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            return hashlib.blake2b(value, digest_size=16).digest()
+    client = scope.get("client")
+    return client[0].encode() if client else b""
+
+
+class PrimaryStickiness:
+    """Tracks clients that recently wrote, so their reads go to the primary.
+
+    State is per process, which covers the common case of a client reading
+    back its own write on the same connection. Expired entries are pruned
+    once the table grows past ``max_clients``.
+    """
+
+    def __init__(self, window: float, max_clients: int = 100_000):
+        self.window = window
+        self.max_clients = max_clients
+        self._until: dict[bytes, float] = {}
+
+    def mark(self, key: bytes):
+        if self.window <= 0:
+            return
+        now = time.monotonic()
+        if len(self._until) >= self.max_clients:
+            self._until = {k: t for k, t in self._until.items() if t > now}
+            if len(self._until) >= self.max_clients:
+                del self._until[next(iter(self._until))]
+        self._until[key] = now + self.window
+
+    def is_sticky(self, key: bytes) -> bool:
+        until = self._until.get(key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._until[key]
+            return False
+        return True
@@ -27,6 +27,29 @@ class ForbiddenError(Exception):
         self.detail = detail
 
 
+class PreconditionFailedError(Exception):
+    """Exception raised when a conditional request's precondition fails."""
+
+    def __init__(self, detail: str = "Precondition failed"):
+        self.detail = detail
+
+
+class TooManyRequestsError(Exception):
+    """Exception raised when a client exceeds its rate limit."""
+
+    def __init__(self, detail: str = "Too many requests", retry_after: int = 1):
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class ServiceUnavailableError(Exception):
+    """Exception raised when the service sheds load it cannot take on."""
+
+    def __init__(self, detail: str = "Service unavailable", retry_after: int = 1):
+        self.detail = detail
+        self.retry_after = retry_after
+
+
 # Decorators
 def handle_service_exceptions(func):
     """Decorator to handle exceptions while preserving FastAPI dependencies."""
@@ -36,10 +59,12 @@ def handle_service_exceptions(func):
         try:
             return await func(*args, **kwargs)
         except ValidationError as ve:
-            logger.warning(f"Validation error: {ve}")
+            logger.warning("Validation error: {error}", error=ve)
+            raise
+        except (ServiceUnavailableError, TooManyRequestsError):
             raise
         except Exception as exc:
-            logger.exception(f"Unexpected error: {exc}")
+            logger.exception("Unexpected error: {error}", error=exc)
             raise ValidationError("An unexpected error occurred.") from exc
 
     return wrapper
@@ -67,6 +92,35 @@ async def validation_exception_handler(_request: Request, exc: ValidationError):
     )
 
 
+async def precondition_failed_exception_handler(
+    _request: Request, exc: PreconditionFailedError
+):
+    return JSONResponse(
+        status_code=412,
+        content={"detail": exc.detail},
+    )
+
+
+async def too_many_requests_exception_handler(
+    _request: Request, exc: TooManyRequestsError
+):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def service_unavailable_exception_handler(
+    _request: Request, exc: ServiceUnavailableError
+):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 async def generic_exception_handler(_request: Request, exc: Exception):
     return JSONResponse(
         status_code=500,
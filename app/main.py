@@ -1,26 +1,91 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
 
-from app.api.routes import auth_routes, group_routes, role_routes, user_routes
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.api.middleware import (
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+    instrument_routes,
+)
+from app.api.routes import (
+    auth_routes,
+    event_routes,
+    group_routes,
+    role_routes,
+    user_routes,
+)
+from app.core.logs import configure_logging
+from app.core.redis_client import redis_client
+from app.core.security import password_hasher
+from app.core.settings import settings
+from app.db.session import AsyncSessionLocal, database
 from app.exceptions import (
     ForbiddenError,
     NotFoundError,
+    PreconditionFailedError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
     ValidationError,
     forbidden_exception_handler,
     generic_exception_handler,
     not_found_exception_handler,
+    precondition_failed_exception_handler,
+    service_unavailable_exception_handler,
+    too_many_requests_exception_handler,
     validation_exception_handler,
 )
+from app.services.outbox_relay import OutboxRelay
+
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    database.connect()
+    relay = None
+    if settings.EVENT_OUTBOX_ENABLED:
+        relay = OutboxRelay(
+            AsyncSessionLocal,
+            redis_client,
+            batch_size=settings.OUTBOX_BATCH_SIZE,
+            poll_interval=settings.OUTBOX_POLL_INTERVAL,
+            max_backoff=settings.OUTBOX_MAX_BACKOFF,
+        )
+        relay.start()
+    yield
+    if relay is not None:
+        await relay.stop()
+    await database.disconnect()
+    password_hasher.shutdown()
+
 
-app = FastAPI(title="User Service", version="1.0.0")
+app = FastAPI(
+    title="User Service",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 # Register exception handlers
 app.add_exception_handler(ForbiddenError, forbidden_exception_handler)
 app.add_exception_handler(NotFoundError, not_found_exception_handler)
 app.add_exception_handler(ValidationError, validation_exception_handler)
+app.add_exception_handler(
+    PreconditionFailedError, precondition_failed_exception_handler
+)
+app.add_exception_handler(TooManyRequestsError, too_many_requests_exception_handler)
+app.add_exception_handler(
+    ServiceUnavailableError, service_unavailable_exception_handler
+)
 app.add_exception_handler(Exception, generic_exception_handler)
 
 # Include routers
 app.include_router(auth_routes.router, prefix="/auth", tags=["auth"])
+app.include_router(event_routes.router, prefix="/events", tags=["events"])
 app.include_router(group_routes.router, prefix="/groups", tags=["groups"])
 app.include_router(role_routes.router, prefix="/roles", tags=["roles"])
 app.include_router(user_routes.router, prefix="/users", tags=["users"])
@@ -29,3 +94,12 @@ app.include_router(user_routes.router, prefix="/users", tags=["users"])
 @app.get("/")
 async def root():
     return {"message": "User Service is running"}
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+    instrument_routes(app)
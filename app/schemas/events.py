@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class StreamEvent(BaseModel):
+    id: str
+    event: dict
+
+
+class EventReplay(BaseModel):
+    events: list[StreamEvent]
+    next_id: Optional[str] = None
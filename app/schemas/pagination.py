@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Any, Generic, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from app.exceptions import ValidationError
+
+ItemType = TypeVar("ItemType")
+
+
+class Page(BaseModel, Generic[ItemType]):
+    items: list[ItemType]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(last_id: Any) -> str:
+    raw = json.dumps({"id": str(last_id)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return str(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValidationError("Invalid cursor") from exc
@@ -30,3 +30,44 @@ class UserRetrieve(UserBase):
     def model_dump(self, **kwargs):
         kwargs.setdefault("exclude", {"hashed_password"})
         return super().model_dump(**kwargs)
+
+
+class BulkCreateConflict(BaseModel):
+    index: int
+    email: EmailStr
+    detail: str
+
+
+class UserBulkCreateResult(BaseModel):
+    created: list[UserRetrieve]
+    conflicts: list[BulkCreateConflict]
+
+
+class UserBatchGet(BaseModel):
+    ids: Optional[list[UUID]] = None
+    emails: Optional[list[EmailStr]] = None
+
+
+class UserBatchGetResult(BaseModel):
+    items: list[UserRetrieve]
+    missing: list[str]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportBatchFailure(BaseModel):
+    first_line: int
+    last_line: int
+    detail: str
+
+
+class UserImportResult(BaseModel):
+    inserted: int
+    skipped: int
+    invalid: int
+    errors: list[ImportRowError]
+    unpublished: int = 0
+    failed: Optional[ImportBatchFailure] = None
@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_password_async
 from app.db.repositories.user_repo import UserRepository
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
@@ -10,11 +10,15 @@ class AuthService:
     def __init__(self, repo: UserRepository):
         self.repo = repo
 
-    def authenticate_user(self, email: str, password: str):
-        user = self.repo.get_user_by_email(email)
-        if not user or not verify_password(password, user.hashed_password):
+    async def authenticate_user(self, email: str, password: str):
+        credentials = await self.repo.get_credentials(email)
+        if not credentials or not await verify_password_async(
+            password, credentials.hashed_password
+        ):
             return None
-        return user
+        if credentials.is_active is False:
+            return None
+        return credentials
 
     def create_token(self, user):
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -1,101 +1,447 @@
+from contextlib import contextmanager
 import json
-from typing import Generic, TypeVar
+import time
+from typing import Any, Generic, Optional, Sequence, TypeVar
 
 from loguru import logger
 from pydantic import BaseModel
 
+from app.core.entity_cache import EntityCache
+from app.core.events import publish, publish_many
+from app.core.metrics import EVENT_PUBLISH_DURATION, EVENT_PUBLISH_FAILURES
 from app.core.redis_client import RedisClient
-from app.core.security import get_password_hash
+from app.core.security import hash_password_async, hash_passwords_async
+from app.core.settings import settings
+from app.core.singleflight import single_flight
+from app.db.loader import adopt, get_loader
 from app.db.repositories.base_repo import BaseRepository
-from app.exceptions import NotFoundError
+from app.db.repositories.outbox_repo import OutboxRepository
+from app.exceptions import NotFoundError, PreconditionFailedError, ValidationError
+from app.schemas.pagination import decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+@contextmanager
+def _publish_metrics(channel: str):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EVENT_PUBLISH_FAILURES.labels(channel).inc()
+        raise
+    finally:
+        EVENT_PUBLISH_DURATION.labels(channel).observe(time.perf_counter() - start)
+
+
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    sensitive_fields = frozenset({"password", "hashed_password"})
+    # Seconds to keep entities in the read-through cache (0 disables it)
+    cache_ttl: int = 0
+    # Unique fields that get_by_field may answer from the cache or a batch
+    cache_lookup_fields: tuple[str, ...] = ()
+
     def __init__(
         self, repository: BaseRepository[ModelType], redis_client: RedisClient
     ):
         self.repository = repository
         self.redis_client = redis_client
+        self.outbox = OutboxRepository(repository.db)
+        self.cache = None
+        if settings.ENTITY_CACHE_ENABLED and self.cache_ttl > 0:
+            self.cache = EntityCache(
+                redis_client,
+                repository.model,
+                ttl=self.cache_ttl,
+                lookup_fields=self.cache_lookup_fields,
+                exclude=self.sensitive_fields,
+            )
 
     def _get_model_name(self) -> str:
         return self.repository.model.__name__
 
-    async def _publish_event(self, event_type: str, payload: dict):
-        sensitive_fields = {"password", "hashed_password"}
+    def _get_event_channel(self) -> str:
+        return f"{self._get_model_name().lower()}-events"
+
+    def _build_event(self, event_type: str, payload: dict) -> dict:
         filtered_payload = {
-            key: value for key, value in payload.items() if key not in sensitive_fields
+            key: value
+            for key, value in payload.items()
+            if key not in self.sensitive_fields
         }
-        event = {
+        return {
             "event_type": event_type,
             "model": self._get_model_name(),
             "payload": filtered_payload,
         }
-        channel = f"{self._get_model_name().lower()}-events"
-        logger.info(f"Publishing event to channel {channel}: {event}")
-        await self.redis_client.publish(channel, json.dumps(event, default=str))
+
+    def _serialize_event(self, event_type: str, payload: dict) -> str:
+        return json.dumps(self._build_event(event_type, payload), default=str)
+
+    async def _publish_event(self, event_type: str, payload: dict):
+        event = self._build_event(event_type, payload)
+        channel = self._get_event_channel()
+        logger.debug(
+            "Publishing {event_type} event to {channel}",
+            event_type=event_type,
+            channel=channel,
+        )
+        with _publish_metrics(channel):
+            await publish(self.redis_client, channel, json.dumps(event, default=str))
+
+    async def _publish_events(self, event_type: str, payloads: list[dict]):
+        """Publish a batch of events in a single pipelined round trip."""
+        if not payloads:
+            return
+        channel = self._get_event_channel()
+        logger.debug(
+            "Publishing {count} {event_type} events to {channel}",
+            count=len(payloads),
+            event_type=event_type,
+            channel=channel,
+        )
+        messages = [(channel, self._serialize_event(event_type, p)) for p in payloads]
+        with _publish_metrics(channel):
+            await publish_many(self.redis_client, messages)
+
+    async def _commit_with_events(
+        self,
+        event_type: str,
+        payloads: list[dict],
+        versions: Optional[dict[Any, int]] = None,
+    ):
+        """Commit the pending write and emit its change events.
+
+        With the outbox enabled the events are inserted in the same transaction
+        and relayed to Redis in the background; otherwise they are published
+        once the commit has succeeded. ``versions`` maps entity IDs to the
+        versions just committed, which keeps older reads out of the cache.
+        """
+        await self._commit_staging_events(event_type, payloads, versions)
+        await self._publish_committed_events(event_type, payloads)
+
+    async def _commit_staging_events(
+        self,
+        event_type: str,
+        payloads: list[dict],
+        versions: Optional[dict[Any, int]] = None,
+    ):
+        """Commit, with the events in the outbox if enabled, and invalidate."""
+        if settings.EVENT_OUTBOX_ENABLED:
+            self.outbox.add_events(
+                self._get_event_channel(),
+                [self._serialize_event(event_type, p) for p in payloads],
+            )
+        await self.repository.commit()
+
+        if event_type in ("update", "delete"):
+            # Reads already in flight may predate the commit; don't join them
+            model = self.repository.model
+            single_flight.forget(lambda key: key[0] is model)
+        if self.cache and event_type in ("update", "delete"):
+            for payload in payloads:
+                await self.cache.invalidate(
+                    payload["id"], (versions or {}).get(payload["id"])
+                )
+
+    async def _publish_committed_events(self, event_type: str, payloads: list[dict]):
+        """Publish the events of a commit; the outbox relay does it when enabled."""
+        if settings.EVENT_OUTBOX_ENABLED:
+            return
+        if len(payloads) == 1:
+            await self._publish_event(event_type, payloads[0])
+        else:
+            await self._publish_events(event_type, payloads)
+
+    @staticmethod
+    async def _hash_passwords(data_dicts: list[dict]):
+        """Replace ``password`` with ``hashed_password`` across a batch."""
+        pending = [data_dict for data_dict in data_dicts if "password" in data_dict]
+        hashed_passwords = await hash_passwords_async(
+            [data_dict.pop("password") for data_dict in pending]
+        )
+        for data_dict, hashed_password in zip(pending, hashed_passwords):
+            data_dict["hashed_password"] = hashed_password
+
+    def _filter_model_fields(self, data_dict: dict) -> dict:
+        return {
+            key: value
+            for key, value in data_dict.items()
+            if hasattr(self.repository.model, key)
+        }
 
     async def create(self, create_data: CreateSchemaType) -> ModelType:
         data_dict = create_data.model_dump()
-        logger.debug(f"Creating {self._get_model_name()} with data: {data_dict}")
+        logger.debug("Creating {model}", model=self._get_model_name())
 
         # Hash password if it exists in the data
         if "password" in data_dict:
-            data_dict["hashed_password"] = get_password_hash(data_dict.pop("password"))
+            data_dict["hashed_password"] = await hash_password_async(
+                data_dict.pop("password")
+            )
 
         # Filter valid fields based on the model
-        valid_fields = {
-            key: value
-            for key, value in data_dict.items()
-            if hasattr(self.repository.model, key)
-        }
+        valid_fields = self._filter_model_fields(data_dict)
 
         # Create the entity in the database
-        entity = await self.repository.create(valid_fields)
+        entity = await self.repository.create(valid_fields, commit=False)
 
         # Convert the ID to a string for the event payload
         valid_fields["id"] = str(entity.id)
 
-        # Publish the creation event with the full payload
-        await self._publish_event("create", valid_fields)
+        # Commit along with the creation event for the full payload
+        await self._commit_with_events("create", [valid_fields])
+        return entity
+
+    async def _prepare_rows(
+        self, create_data: list[CreateSchemaType], conflict_field: str
+    ) -> dict[int, dict]:
+        """Build insertable rows keyed by item index, minus known conflicts.
+
+        Items whose ``conflict_field`` repeats an earlier item or an existing
+        row are left out. Existing values are looked up before hashing so
+        conflicting rows never cost a bcrypt round.
+        """
+        values = [getattr(item, conflict_field) for item in create_data]
+        seen = await self.repository.get_existing_values(conflict_field, values)
+        candidates: dict[int, dict] = {}
+        for index, (item, value) in enumerate(zip(create_data, values)):
+            if value not in seen:
+                seen.add(value)
+                candidates[index] = item.model_dump()
+
+        await self._hash_passwords(list(candidates.values()))
+        return {
+            index: self._filter_model_fields(data_dict)
+            for index, data_dict in candidates.items()
+        }
+
+    async def create_many(
+        self, create_data: list[CreateSchemaType], conflict_field: str
+    ) -> tuple[list[ModelType], list[int]]:
+        """Create entities in bulk.
+
+        Conflicting items are skipped; their indexes are returned alongside
+        the created entities.
+        """
+        rows = await self._prepare_rows(create_data, conflict_field)
+        entities = await self.repository.create_many(
+            list(rows.values()), conflict_field, commit=False
+        )
+
+        created = {getattr(entity, conflict_field): entity for entity in entities}
+        await self._commit_with_events(
+            "create",
+            [
+                {**row, "id": str(created[row[conflict_field]].id)}
+                for row in rows.values()
+                if row[conflict_field] in created
+            ],
+        )
+        skipped = [
+            index
+            for index in range(len(create_data))
+            if index not in rows or rows[index][conflict_field] not in created
+        ]
+        return entities, skipped
+
+    async def import_many(
+        self, create_data: list[CreateSchemaType], conflict_field: str
+    ) -> tuple[int, bool]:
+        """Load a batch through ``COPY`` where available and commit it.
+
+        Unlike ``create_many`` no entities are loaded back. Returns the number
+        of inserted rows and whether their create events were published. Once
+        the commit has succeeded the rows are in, so a failure to publish is
+        logged rather than raised.
+        """
+        rows = await self._prepare_rows(create_data, conflict_field)
+        inserted = dict(
+            await self.repository.copy_many(
+                list(rows.values()), conflict_field, commit=False
+            )
+        )
+        payloads = [
+            {**row, "id": str(inserted[row[conflict_field]])}
+            for row in rows.values()
+            if row[conflict_field] in inserted
+        ]
+        await self._commit_staging_events("create", payloads)
+        try:
+            await self._publish_committed_events("create", payloads)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "Publishing {count} imported {model} events failed: {error}",
+                count=len(payloads),
+                model=self._get_model_name(),
+                error=exc,
+            )
+            return len(inserted), False
+        return len(inserted), True
+
+    async def _load_one(self, field_name: str, value: Any) -> Optional[ModelType]:
+        """Load by a unique field, coalescing with concurrent lookups."""
+        loader = get_loader(self.repository.model, field_name, settings.BATCH_GET_MAX)
+        return await loader.load(self.repository.db, value)
+
+    def _flight_key(self, field_name: str, value: Any) -> tuple:
+        # The bind keeps primary and replica reads from answering each other
+        return (self.repository.model, field_name, value, self.repository.db.bind)
+
+    async def _fetch_by_id(self, entity_id: Any) -> Optional[ModelType]:
+        entity = await self.cache.get(entity_id) if self.cache else None
+        if entity is None:
+            entity = await self._load_one("id", entity_id)
+            if entity and self.cache:
+                await self.cache.set(entity)
         return entity
 
     async def get_by_id(self, entity_id: int) -> ModelType:
-        entity = await self.repository.get_by_id(entity_id)
+        entity = await single_flight.do(
+            self._flight_key("id", entity_id),
+            lambda: self._fetch_by_id(entity_id),
+            label=self._get_model_name(),
+            adopt=lambda entity: adopt(self.repository.db, entity),
+        )
         if not entity:
             raise NotFoundError(
                 detail=f"{self._get_model_name()} with ID {entity_id} not found"
             )
         return entity
 
-    async def get_by_field(self, field_name: str, value: any) -> list[ModelType]:
-        return await self.repository.get_by_field(field_name, value)
+    async def get_version(self, entity_id: Any) -> Optional[int]:
+        """Return the entity's row version, or ``None`` if it does not exist.
 
-    async def get_all(self, skip: int = 0, limit: int = 10) -> list[ModelType]:
-        return await self.repository.get_all(skip, limit)
+        Served from the entity cache when possible, otherwise by a single
+        column query; no ORM entity is built either way.
+        """
+        if self.cache:
+            version = await self.cache.get_value(entity_id, "version")
+            if version is not None:
+                return version
+        return await self.repository.get_version(entity_id)
 
-    async def update(self, entity_id: int, update_data: UpdateSchemaType) -> ModelType:
-        entity = await self.repository.get_by_id(entity_id)
-        if not entity:
+    async def _fetch_by_field(
+        self, field_name: str, value: Any, use_cache: bool
+    ) -> list[ModelType]:
+        cacheable = (
+            use_cache
+            and self.cache is not None
+            and field_name in self.cache.lookup_fields
+        )
+        if cacheable:
+            entity = await self.cache.get_by_field(field_name, value)
+            if entity is not None:
+                return [entity]
+        if field_name in self.cache_lookup_fields:
+            entity = await self._load_one(field_name, value)
+            entities = [entity] if entity is not None else []
+        else:
+            entities = await self.repository.get_by_field(field_name, value)
+        if cacheable and len(entities) == 1:
+            await self.cache.set(entities[0], field_name=field_name)
+        return entities
+
+    async def _adopt_all(self, entities: list[ModelType]) -> list[ModelType]:
+        return [await adopt(self.repository.db, entity) for entity in entities]
+
+    async def get_by_field(
+        self, field_name: str, value: any, use_cache: bool = True
+    ) -> list[ModelType]:
+        """Fetch entities by field, using the cache for unique lookup fields.
+
+        Cached entities omit ``sensitive_fields``; pass ``use_cache=False`` when
+        the caller needs them (e.g. to verify a password). Identical concurrent
+        calls share one read.
+        """
+        return await single_flight.do(
+            (*self._flight_key(field_name, value), use_cache),
+            lambda: self._fetch_by_field(field_name, value, use_cache),
+            label=self._get_model_name(),
+            adopt=self._adopt_all,
+        )
+
+    async def get_many(self, field_name: str, values: list) -> list[ModelType]:
+        """Fetch the entities matching any of ``values`` in one query."""
+        return await self.repository.get_many(field_name, values)
+
+    async def get_page(
+        self, cursor: Optional[str] = None, limit: int = settings.PAGE_SIZE_DEFAULT
+    ) -> tuple[list[ModelType], Optional[str]]:
+        """Return one page of entities ordered by ID and the cursor for the next."""
+        entities, has_more = await self.repository.get_page(
+            self._decode_page_cursor(cursor), limit
+        )
+        next_cursor = encode_cursor(entities[-1].id) if has_more else None
+        return entities, next_cursor
+
+    async def get_page_rows(
+        self,
+        field_names: Sequence[str],
+        cursor: Optional[str] = None,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Return one page as plain dicts of ``field_names`` and the next cursor."""
+        rows, has_more = await self.repository.get_page_rows(
+            field_names, self._decode_page_cursor(cursor), limit
+        )
+        next_cursor = encode_cursor(rows[-1].id) if has_more else None
+        return [row._asdict() for row in rows], next_cursor
+
+    def _decode_page_cursor(self, cursor: Optional[str]) -> Optional[Any]:
+        if cursor is None:
+            return None
+        id_type = self.repository.model.id.type.python_type
+        try:
+            return id_type(decode_cursor(cursor))
+        except ValueError as exc:
+            raise ValidationError("Invalid cursor") from exc
+
+    async def update(
+        self,
+        entity_id: int,
+        update_data: UpdateSchemaType,
+        expected_versions: Optional[list[int]] = None,
+    ) -> ModelType:
+        """Update an entity, optionally only if its version is still expected.
+
+        Raises ``PreconditionFailedError`` when the entity exists but has moved
+        on from ``expected_versions``.
+        """
+        updated_fields = self._filter_model_fields(
+            update_data.model_dump(exclude_unset=True)
+        )
+        updated_entity = await self.repository.update_returning(
+            entity_id,
+            updated_fields,
+            commit=False,
+            expected_versions=expected_versions,
+        )
+        if not updated_entity:
+            if (
+                expected_versions is not None
+                and await self.repository.get_version(entity_id) is not None
+            ):
+                raise PreconditionFailedError(
+                    f"{self._get_model_name()} with ID {entity_id} has been modified"
+                )
             raise NotFoundError(
                 detail=f"{self._get_model_name()} with ID {entity_id} not found"
             )
-        updated_fields = update_data.model_dump(exclude_unset=True)
-        updated_entity = await self.repository.update(entity_id, updated_fields)
-        await self._publish_event("update", {"id": entity_id, **updated_fields})
+        await self._commit_with_events(
+            "update",
+            [{"id": entity_id, **updated_fields}],
+            versions={entity_id: getattr(updated_entity, "version", None)},
+        )
         return updated_entity
 
     async def delete(self, entity_id: int) -> bool:
-        entity = await self.repository.get_by_id(entity_id)
-        if not entity:
+        success = await self.repository.delete_returning(entity_id, commit=False)
+        if not success:
             raise NotFoundError(
                 detail=f"{self._get_model_name()} with ID {entity_id} not found"
             )
-
-        success = await self.repository.delete(entity_id)
-        if success:
-            await self._publish_event("delete", {"id": entity_id})
+        await self._commit_with_events("delete", [{"id": entity_id}])
         return success
@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Literal, Sequence, Type
+
+from app.db.repositories.base_repo import BaseRepository
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class ExportService:
+    """Streams a table as NDJSON or CSV without materializing it.
+
+    Each export opens its own session from ``session_factory`` because the
+    response body is produced after the request's dependencies are closed.
+    Rows are read from a server-side cursor and encoded one batch per chunk.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        repository_class: Type[BaseRepository],
+        fields: Sequence[str],
+        batch_size: int,
+    ):
+        self.session_factory = session_factory
+        self.repository_class = repository_class
+        self.fields = tuple(fields)
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _encode_ndjson(rows: list) -> str:
+        return "".join(
+            json.dumps(row._asdict(), default=str, separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+    @staticmethod
+    def _encode_csv(rows: list) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+
+    async def stream(
+        self, export_format: ExportFormat, **filters: Any
+    ) -> AsyncIterator[str]:
+        encode = self._encode_csv if export_format == "csv" else self._encode_ndjson
+        if export_format == "csv":
+            yield self._encode_csv([self.fields])
+        async with self.session_factory() as session:
+            repository = self.repository_class(session)
+            async for rows in repository.stream_columns(
+                self.fields, self.batch_size, **filters
+            ):
+                yield encode(rows)
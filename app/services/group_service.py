@@ -1,4 +1,5 @@
 from app.core.redis_client import RedisClient
+from app.core.settings import settings
 from app.db.models import Group
 from app.db.repositories.group_repo import GroupRepository
 from app.schemas.groups import GroupCreate, GroupUpdate
@@ -6,5 +7,8 @@ from app.services.base_service import BaseService
 
 
 class GroupService(BaseService[Group, GroupCreate, GroupUpdate]):
+    cache_ttl = settings.GROUP_CACHE_TTL
+    cache_lookup_fields = ("name",)
+
     def __init__(self, repository: GroupRepository, redis_client: RedisClient):
         super().__init__(repository, redis_client)
@@ -0,0 +1,145 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Literal, Optional, Type
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.exceptions import ValidationError
+from app.services.base_service import BaseService
+
+ImportFormat = Literal["ndjson", "csv"]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed UTF-8 body into lines without buffering all of it."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise ValidationError("Import body is not valid UTF-8") from exc
+    if pending:
+        yield pending
+
+
+class ImportService:
+    """Loads a streamed NDJSON or CSV body in batches.
+
+    Records are parsed and validated one line at a time; every
+    ``batch_size`` valid records are handed to ``BaseService.import_many``,
+    which hashes passwords in the worker pool, loads the batch and emits its
+    events. CSV records must not contain quoted newlines.
+
+    An import is not atomic: each batch is committed on its own. If a batch
+    fails, it is rolled back, the rest of the body is left unread and the
+    summary records the failed batch's line range under ``failed``, so the
+    client knows which earlier lines are already in. Rows that were committed
+    but whose events could not be published are counted in ``unpublished``.
+    """
+
+    def __init__(
+        self,
+        service: BaseService,
+        schema: Type[BaseModel],
+        conflict_field: str,
+        batch_size: int,
+        max_errors: int,
+    ):
+        self.service = service
+        self.schema = schema
+        self.conflict_field = conflict_field
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    @staticmethod
+    def _parse_csv_line(line: str, header: list[str]) -> dict:
+        values = next(csv.reader([line]))
+        if len(values) != len(header):
+            raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+        # Empty cells fall back to the schema defaults
+        return {key: value for key, value in zip(header, values) if value != ""}
+
+    async def _flush(
+        self, batch: list[BaseModel], batch_lines: list[int], summary: dict
+    ) -> bool:
+        """Import ``batch``; on failure record its line range and return False."""
+        if not batch:
+            return True
+        try:
+            inserted, published = await self.service.import_many(
+                batch, self.conflict_field
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "Import batch at lines {first_line}-{last_line} failed: {error}",
+                first_line=batch_lines[0],
+                last_line=batch_lines[-1],
+                error=exc,
+            )
+            await self.service.repository.rollback()
+            summary["failed"] = {
+                "first_line": batch_lines[0],
+                "last_line": batch_lines[-1],
+                "detail": "Batch could not be imported; later lines were not read",
+            }
+            return False
+        summary["inserted"] += inserted
+        summary["skipped"] += len(batch) - inserted
+        if not published:
+            summary["unpublished"] += inserted
+        batch.clear()
+        batch_lines.clear()
+        return True
+
+    def _record_error(self, summary: dict, line_number: int, detail: str):
+        summary["invalid"] += 1
+        if len(summary["errors"]) < self.max_errors:
+            summary["errors"].append({"line": line_number, "detail": detail})
+
+    async def run(
+        self, chunks: AsyncIterator[bytes], import_format: ImportFormat
+    ) -> dict:
+        summary = {
+            "inserted": 0,
+            "skipped": 0,
+            "invalid": 0,
+            "errors": [],
+            "unpublished": 0,
+            "failed": None,
+        }
+        header: Optional[list[str]] = None
+        batch: list[BaseModel] = []
+        batch_lines: list[int] = []
+        line_number = 0
+        async for line in iter_lines(chunks):
+            line_number += 1
+            line = line.strip()
+            if not line:
+                continue
+            if import_format == "csv" and header is None:
+                header = next(csv.reader([line]))
+                continue
+            try:
+                record = (
+                    self._parse_csv_line(line, header)
+                    if import_format == "csv"
+                    else json.loads(line)
+                )
+                batch.append(self.schema.model_validate(record))
+            except ValueError as exc:
+                self._record_error(summary, line_number, str(exc))
+                continue
+            batch_lines.append(line_number)
+            if len(batch) >= self.batch_size and not await self._flush(
+                batch, batch_lines, summary
+            ):
+                return summary
+        await self._flush(batch, batch_lines, summary)
+        return summary
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Optional
+
+from loguru import logger
+
+from app.core.events import publish_many
+from app.db.repositories.outbox_repo import OutboxRepository
+
+
+class OutboxRelay:
+    """Background task that drains the outbox table into Redis.
+
+    Each batch is locked, published with one pipelined round trip and deleted
+    in the same transaction. If Redis is unavailable the batch is kept (with
+    its attempt counter bumped) and retried with exponential backoff, so
+    delivery is at-least-once and in commit order per relay.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        redis_client,
+        batch_size: int,
+        poll_interval: float,
+        max_backoff: float,
+    ):
+        self.session_factory = session_factory
+        self.redis_client = redis_client
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as session:
+            repo = OutboxRepository(session)
+            events = await repo.get_batch(self.batch_size)
+            if not events:
+                return 0
+            event_ids = [event.id for event in events]
+            try:
+                await publish_many(
+                    self.redis_client,
+                    [(event.channel, event.payload) for event in events],
+                )
+            except Exception:
+                await repo.record_failure(event_ids)
+                await session.commit()
+                raise
+            await repo.delete_events(event_ids)
+            await session.commit()
+            return len(events)
+
+    async def run(self):
+        backoff = self.poll_interval
+        while True:
+            try:
+                published = await self.run_once()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Outbox relay failed, retrying in {backoff}s: {error}",
+                    backoff=backoff,
+                    error=exc,
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = self.poll_interval
+            if published < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="outbox-relay")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
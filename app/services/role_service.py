@@ -1,4 +1,5 @@
 from app.core.redis_client import RedisClient
+from app.core.settings import settings
 from app.db.models import Role
 from app.db.repositories.role_repo import RoleRepository
 from app.schemas.roles import RoleCreate, RoleUpdate
@@ -6,5 +7,8 @@ from app.services.base_service import BaseService
 
 
 class RoleService(BaseService[Role, RoleCreate, RoleUpdate]):
+    cache_ttl = settings.ROLE_CACHE_TTL
+    cache_lookup_fields = ("name",)
+
     def __init__(self, repository: RoleRepository, redis_client: RedisClient):
         super().__init__(repository, redis_client)
@@ -1,4 +1,8 @@
+from typing import Optional, Sequence
+
 from app.core.redis_client import RedisClient
+from app.core.security import hash_password_async
+from app.core.settings import settings
 from app.db.models import User
 from app.db.repositories.user_repo import UserRepository
 from app.schemas.user import UserCreate, UserUpdate
@@ -6,5 +10,47 @@ from app.services.base_service import BaseService
 
 
 class UserService(BaseService[User, UserCreate, UserUpdate]):
+    cache_ttl = settings.USER_CACHE_TTL
+    cache_lookup_fields = ("email",)
+
     def __init__(self, repository: UserRepository, redis_client: RedisClient):
         super().__init__(repository, redis_client)
+
+    async def register(self, user_create: UserCreate) -> Optional[User]:
+        """Create a user unless the email is taken; returns ``None`` if it is.
+
+        The existence check and the insert are one ``INSERT ... ON CONFLICT``
+        statement, so concurrent registrations cannot both succeed.
+        """
+        data_dict = user_create.model_dump()
+        data_dict["hashed_password"] = await hash_password_async(
+            data_dict.pop("password")
+        )
+        valid_fields = self._filter_model_fields(data_dict)
+        user = await self.repository.create_if_absent(
+            valid_fields, "email", commit=False
+        )
+        if user is None:
+            return None
+        await self._commit_with_events("create", [{**valid_fields, "id": str(user.id)}])
+        return user
+
+    async def get_credentials(self, email: str):
+        """Projection of the columns needed for login; bypasses the cache."""
+        return await self.repository.get_credentials(email)
+
+    @staticmethod
+    def build_token_claims(
+        user: User, roles: Sequence[str] = (), groups: Sequence[str] = ()
+    ) -> dict:
+        return {
+            "sub": user.email,
+            "id": user.id,
+            "roles": list(roles),
+            "groups": list(groups),
+        }
+
+    async def get_token_claims(self, user: User) -> dict:
+        """Build access token claims, including role and group names."""
+        roles, groups = await self.repository.get_role_and_group_names(user.id)
+        return self.build_token_claims(user, roles, groups)
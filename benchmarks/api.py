@@ -0,0 +1,280 @@
+"""Throughput and latency of the HTTP API under concurrent load.
+
+Runs the application in-process through ``httpx.ASGITransport``, as the test
+suite does, against a fresh file-backed SQLite database and fakeredis, so it
+needs no services and results only depend on the machine and the code.
+Unlike the tests, every request gets its own session: the suite shares one
+session per test, which concurrent requests cannot do.
+
+Scenarios, each timed separately after a short warm-up:
+
+* ``register``: ``POST /auth/register`` with new emails.
+* ``login``: ``POST /auth/login`` for seeded users.
+* ``me``: ``GET /users/me`` with a bearer token.
+* ``user``: ``GET /users/{id}`` for seeded users.
+* ``list``: ``GET /users/`` pages of ``--page-size``.
+
+Each reports requests per second and p50/p95/p99 latency. ``--output``
+writes the results as JSON; ``--baseline`` compares against such a file and
+exits with status 1 when a scenario's throughput dropped or its p95 latency
+rose by more than ``--tolerance``, or it failed more requests. Compare runs
+with the same options on the same machine; bcrypt dominates ``register`` and
+``login``, so size ``PASSWORD_HASH_WORKERS`` as in production.
+
+Usage::
+
+    python -m benchmarks.api --requests 500 --concurrency 32 --output base.json
+    python -m benchmarks.api --requests 500 --concurrency 32 --baseline base.json
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+import itertools
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+from fakeredis import FakeAsyncRedis
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.dependencies import get_redis_client
+from app.core.logs import configure_logging
+from app.core.security import create_access_token, get_password_hash
+from app.core.settings import settings
+from app.db.models import Base, User
+from app.db.session import get_db, get_read_session_factory
+from app.main import app
+from benchmarks.reporting import read_report, regression_status, write_report
+
+PASSWORD = "benchmark-password"
+SCENARIOS = ("register", "login", "me", "user", "list")
+
+
+def _enable_wal(dbapi_connection, _record):
+    # Let readers proceed while a writer holds the database
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+async def _seed(session_factory, users: int) -> list[uuid.UUID]:
+    hashed_password = get_password_hash(PASSWORD)
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    async with session_factory() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "email": f"seed{index}@example.com",
+                    "first_name": "Seed",
+                    "last_name": "User",
+                    "hashed_password": hashed_password,
+                }
+                for index, user_id in enumerate(user_ids)
+            ],
+        )
+        await session.commit()
+    return user_ids
+
+
+def _requests(scenario: str, user_ids: list[uuid.UUID], page_size: int):
+    """Return a function building the ``index``-th request of ``scenario``."""
+    users = len(user_ids)
+    if scenario == "register":
+        # Unique across the warm-up and timed runs
+        new_users = itertools.count()
+        run_id = uuid.uuid4().hex[:8]
+        return lambda _index: (
+            "POST",
+            "/auth/register",
+            {
+                "json": {
+                    "email": f"new{run_id}-{next(new_users)}@example.com",
+                    "password": PASSWORD,
+                }
+            },
+        )
+    if scenario == "login":
+        return lambda index: (
+            "POST",
+            "/auth/login",
+            {
+                "json": {
+                    "email": f"seed{index % users}@example.com",
+                    "password": PASSWORD,
+                }
+            },
+        )
+    if scenario == "me":
+        headers = [
+            {
+                "Authorization": "Bearer "
+                + create_access_token(
+                    {"sub": f"seed{index}@example.com", "id": user_id},
+                    timedelta(hours=1),
+                )
+            }
+            for index, user_id in enumerate(user_ids)
+        ]
+        return lambda index: ("GET", "/users/me", {"headers": headers[index % users]})
+    if scenario == "user":
+        return lambda index: ("GET", f"/users/{user_ids[index % users]}", {})
+    if scenario == "list":
+        return lambda index: ("GET", "/users/", {"params": {"limit": page_size}})
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def _run(client: AsyncClient, build, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def _worker():
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            method, url, kwargs = build(index)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    }
+
+
+async def run_benchmarks(args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}",
+            connect_args={"timeout": 30},
+        )
+        event.listen(engine.sync_engine, "connect", _enable_wal)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        redis = FakeAsyncRedis(decode_responses=True)
+
+        async def _get_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _get_db
+        app.dependency_overrides[get_read_session_factory] = lambda: session_factory
+        app.dependency_overrides[get_redis_client] = lambda: redis
+
+        results = {}
+        try:
+            user_ids = await _seed(session_factory, args.users)
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://testserver"
+            ) as client:
+                for scenario in args.scenarios:
+                    build = _requests(scenario, user_ids, args.page_size)
+                    await _run(client, build, args.warmup, args.concurrency)
+                    results[scenario] = await _run(
+                        client, build, args.requests, args.concurrency
+                    )
+        finally:
+            app.dependency_overrides.clear()
+            await redis.aclose()
+            await engine.dispose()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a description of each regression against ``baseline``."""
+    regressions = []
+    for scenario, current in results.items():
+        previous = baseline.get(scenario)
+        if previous is None:
+            continue
+        if current["errors"] > previous["errors"]:
+            regressions.append(
+                f"{scenario}: {current['errors']} errors, baseline {previous['errors']}"
+            )
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{scenario}: {current['rps']:.1f} req/s, "
+                f"baseline {previous['rps']:.1f} req/s"
+            )
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{scenario}: p95 {current['p95_ms']:.2f} ms, "
+                f"baseline {previous['p95_ms']:.2f} ms"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Per-request logging would dominate the measurements
+    settings.LOG_LEVEL = "WARNING"
+    configure_logging()
+
+    results = asyncio.run(run_benchmarks(args))
+
+    print(
+        f"{args.requests} requests per scenario, concurrency {args.concurrency}\n"
+        f"{'scenario':>10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'errors':>7}"
+    )
+    for scenario, result in results.items():
+        print(
+            f"{scenario:>10} {result['rps']:9.1f} {result['p50_ms']:9.2f} "
+            f"{result['p95_ms']:9.2f} {result['p99_ms']:9.2f} {result['errors']:7}"
+        )
+
+    if args.output:
+        write_report(
+            args.output,
+            {
+                "python": platform.python_version(),
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "results": results,
+            },
+        )
+    if args.baseline:
+        baseline = read_report(args.baseline)["results"]
+        return regression_status(compare(results, baseline, args.tolerance))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""JSON result files and regression reporting shared by the benchmarks."""
+
+import json
+import sys
+
+
+def write_report(path: str, report: dict):
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+
+
+def read_report(path: str) -> dict:
+    with open(path, encoding="utf-8") as report_file:
+        return json.load(report_file)
+
+
+def regression_status(regressions: list[str]) -> int:
+    """Print each regression and return the process exit status."""
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,214 @@
+"""Microbenchmarks for the password and token primitives in app.core.security.
+
+Times ``get_password_hash``, ``verify_password``, ``create_access_token`` and
+``decode_access_token`` called back to back on one thread (``serial``) and
+from ``--threads`` threads at once (``concurrent``). bcrypt releases the GIL,
+so its concurrent throughput should scale with cores, while the JWT functions
+run mostly under the GIL. ``decode_access_token`` is measured with the
+decoded-token cache both bypassed and warm. Everything runs offline.
+
+Results are written with ``--output`` as JSON::
+
+    {
+      "format": 1,
+      "environment": {"python": ..., "passlib": ..., "bcrypt_rounds": 12, ...},
+      "results": {
+        "verify_password/serial": {
+          "operations": 8, "ops_per_sec": ..., "mean_ms": ..., "p95_ms": ...
+        },
+        ...
+      }
+    }
+
+``--baseline`` compares against such a file and exits with status 1 when a
+benchmark's throughput fell by more than its threshold, or when the bcrypt
+cost factor changed. ``--tolerance`` sets the default threshold and
+``--threshold NAME=FRACTION`` overrides it for one benchmark, e.g.
+``--threshold create_access_token/concurrent=0.5`` for a noisy runner.
+
+Usage::
+
+    python -m benchmarks.security --output security.json
+    python -m benchmarks.security --baseline security.json --tolerance 0.1
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version
+import platform
+import statistics
+import sys
+import time
+from typing import Callable
+import uuid
+
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    token_cache,
+    verify_password,
+)
+from benchmarks.reporting import read_report, regression_status, write_report
+
+FORMAT_VERSION = 1
+PASSWORD = "benchmark-password"
+
+
+def _timed(func: Callable[[int], object], index: int) -> float:
+    start = time.perf_counter()
+    func(index)
+    return time.perf_counter() - start
+
+
+def _summary(latencies: list[float], elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "operations": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p95_ms": latencies[max(0, round(len(latencies) * 0.95) - 1)] * 1000,
+    }
+
+
+def run_serial(func: Callable[[int], object], operations: int) -> dict:
+    start = time.perf_counter()
+    latencies = [_timed(func, index) for index in range(operations)]
+    return _summary(latencies, time.perf_counter() - start)
+
+
+def run_concurrent(
+    func: Callable[[int], object], operations: int, threads: int
+) -> dict:
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # Start the workers before timing
+        list(executor.map(lambda _: None, range(threads)))
+        start = time.perf_counter()
+        latencies = list(executor.map(_timed, [func] * operations, range(operations)))
+        elapsed = time.perf_counter() - start
+    return _summary(latencies, elapsed)
+
+
+def run_benchmarks(args) -> tuple[dict, dict]:
+    hashed_password = get_password_hash(PASSWORD)
+    claims = [
+        {"sub": f"user{index}@example.com", "id": uuid.uuid4(), "roles": ["member"]}
+        for index in range(args.token_operations)
+    ]
+    tokens = [create_access_token(claim) for claim in claims]
+
+    password_benchmarks = {
+        "get_password_hash": lambda _: get_password_hash(PASSWORD),
+        "verify_password": lambda _: verify_password(PASSWORD, hashed_password),
+    }
+    token_benchmarks = {
+        "create_access_token": lambda index: create_access_token(claims[index]),
+        "decode_access_token": lambda index: decode_access_token(tokens[index]),
+        "decode_access_token_cached": (
+            lambda index: decode_access_token(tokens[index % 100])
+        ),
+    }
+
+    results = {}
+    cache_size = token_cache.max_size
+    for benchmarks, operations in (
+        (password_benchmarks, args.password_operations),
+        (token_benchmarks, args.token_operations),
+    ):
+        for name, func in benchmarks.items():
+            # A size of 0 bypasses the decoded-token cache
+            token_cache.max_size = cache_size if name.endswith("_cached") else 0
+            func(0)  # warm up
+            results[f"{name}/serial"] = run_serial(func, operations)
+            results[f"{name}/concurrent"] = run_concurrent(
+                func, operations, args.threads
+            )
+    token_cache.max_size = cache_size
+
+    environment = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "passlib": version("passlib"),
+        "bcrypt": version("bcrypt"),
+        "python-jose": version("python-jose"),
+        "bcrypt_rounds": int(hashed_password.split("$")[2]),
+        "threads": args.threads,
+    }
+    return environment, results
+
+
+def parse_thresholds(items: list[str]) -> dict[str, float]:
+    thresholds = {}
+    for item in items:
+        name, _, fraction = item.partition("=")
+        thresholds[name] = float(fraction)
+    return thresholds
+
+
+def compare(
+    report: dict, baseline: dict, tolerance: float, thresholds: dict[str, float]
+) -> list[str]:
+    """Return a description of each regression against ``baseline``."""
+    regressions = []
+    rounds = report["environment"]["bcrypt_rounds"]
+    previous_rounds = baseline["environment"].get("bcrypt_rounds")
+    if previous_rounds is not None and rounds != previous_rounds:
+        regressions.append(f"bcrypt rounds {rounds}, baseline {previous_rounds}")
+    for name, current in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        threshold = thresholds.get(name, tolerance)
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {current['ops_per_sec']:.1f} ops/s, "
+                f"baseline {previous['ops_per_sec']:.1f} ops/s"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--password-operations", type=int, default=16)
+    parser.add_argument("--token-operations", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--threshold",
+        action="append",
+        default=[],
+        metavar="NAME=FRACTION",
+        help="per-benchmark tolerance, may be repeated",
+    )
+    args = parser.parse_args()
+
+    environment, results = run_benchmarks(args)
+    report = {"format": FORMAT_VERSION, "environment": environment, "results": results}
+
+    print(
+        f"bcrypt rounds {environment['bcrypt_rounds']}, {args.threads} threads\n"
+        f"{'benchmark':>40} {'ops/s':>10} {'mean ms':>9} {'p95 ms':>9}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:>40} {result['ops_per_sec']:10.1f} "
+            f"{result['mean_ms']:9.3f} {result['p95_ms']:9.3f}"
+        )
+
+    if args.output:
+        write_report(args.output, report)
+    if args.baseline:
+        baseline = read_report(args.baseline)
+        if baseline.get("format") != FORMAT_VERSION:
+            print("Baseline was written in another format", file=sys.stderr)
+            return 2
+        return regression_status(
+            compare(report, baseline, args.tolerance, parse_thresholds(args.threshold))
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
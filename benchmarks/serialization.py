@@ -0,0 +1,121 @@
+"""Compare the default and fast serialization paths for a page of users.
+
+Loads ``--rows`` users into an in-memory SQLite database and times, per page:
+
+* ``orm+fastapi``: ORM entities validated against ``Page[UserRetrieve]`` with
+  ``from_attributes``, passed through ``jsonable_encoder`` and ``json.dumps``,
+  which is what a route returning ORM objects costs.
+* ``rows+orjson``: ``UserService.get_page_rows`` and ``page_response``, the
+  path used by the list routes.
+* ``orm+adapter``: ORM entities encoded with ``model_response``, the path used
+  by the lookup routes.
+
+Usage::
+
+    python -m benchmarks.serialization --rows 500 --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.serialization import model_response, page_response, response_fields
+from app.db.models import Base, User
+from app.db.repositories.user_repo import UserRepository
+from app.schemas.pagination import Page
+from app.schemas.user import UserRetrieve
+from app.services.user_service import UserService
+
+
+async def _seed(session: AsyncSession, rows: int):
+    await session.execute(
+        insert(User),
+        [
+            {
+                "id": uuid.uuid4(),
+                "email": f"user{index}@example.com",
+                "first_name": "First",
+                "last_name": "Last",
+                "hashed_password": "x" * 60,
+            }
+            for index in range(rows)
+        ],
+    )
+    await session.commit()
+
+
+async def _time(func, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main(rows: int, repeat: int):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    page_adapter = TypeAdapter(Page[UserRetrieve])
+
+    async with session_factory() as session:
+        await _seed(session, rows)
+
+    async def orm_fastapi():
+        async with session_factory() as session:
+            service = UserService(UserRepository(session), redis_client=None)
+            entities, next_cursor = await service.get_page(limit=rows)
+            page = page_adapter.validate_python(
+                {"items": entities, "next_cursor": next_cursor}, from_attributes=True
+            )
+            json.dumps(jsonable_encoder(page)).encode()
+
+    async def rows_orjson():
+        async with session_factory() as session:
+            service = UserService(UserRepository(session), redis_client=None)
+            items, next_cursor = await service.get_page_rows(
+                response_fields(UserRetrieve), limit=rows
+            )
+            page_response(items, next_cursor)
+
+    async def orm_adapter():
+        async with session_factory() as session:
+            service = UserService(UserRepository(session), redis_client=None)
+            entities, next_cursor = await service.get_page(limit=rows)
+            model_response(
+                Page[UserRetrieve], {"items": entities, "next_cursor": next_cursor}
+            )
+
+    results = {}
+    for name, func in (
+        ("orm+fastapi", orm_fastapi),
+        ("rows+orjson", rows_orjson),
+        ("orm+adapter", orm_adapter),
+    ):
+        await func()  # warm up
+        results[name] = statistics.median(await _time(func, repeat))
+    await engine.dispose()
+
+    baseline = results["orm+fastapi"]
+    print(f"{rows} rows per page, median of {repeat} runs")
+    for name, median in results.items():
+        print(f"{name:>12}: {median * 1000:8.2f} ms  {baseline / median:5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
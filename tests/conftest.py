@@ -1,16 +1,27 @@
+from contextlib import contextmanager
 from unittest.mock import AsyncMock
 
+from fakeredis import FakeAsyncRedis
 from httpx import ASGITransport, AsyncClient
+from loguru import logger
 import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.api.dependencies import get_group_service, get_role_service, get_user_service
+from app.api.dependencies import (
+    get_group_read_service,
+    get_group_service,
+    get_role_read_service,
+    get_role_service,
+    get_user_read_service,
+    get_user_service,
+)
 from app.db.models import Base
 from app.db.repositories.group_repo import GroupRepository
 from app.db.repositories.role_repo import RoleRepository
 from app.db.repositories.user_repo import UserRepository
-from app.db.session import get_db
+from app.db.session import get_db, get_read_session_factory
 from app.main import app
 from app.services.group_service import GroupService
 from app.services.role_service import RoleService
@@ -53,21 +64,54 @@ async def _db_session():
     await engine.dispose()
 
 
+@pytest.fixture(name="record_statements")
+def _record_statements(db_session):
+    """Context manager collecting the SQL verb of each statement executed."""
+
+    @contextmanager
+    def _recorder():
+        statements = []
+
+        def _record(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+            statements.append(statement.split(None, 1)[0].upper())
+
+        sync_engine = db_session.get_bind()
+        event.listen(sync_engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", _record)
+
+    return _recorder
+
+
 @pytest.fixture
 async def test_client(db_session, mock_redis_client):
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_session_factory] = lambda: sessionmaker(
+        db_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
 
     app.dependency_overrides[get_group_service] = lambda: GroupService(
         GroupRepository(db_session), mock_redis_client
     )
+    app.dependency_overrides[get_group_read_service] = app.dependency_overrides[
+        get_group_service
+    ]
 
     app.dependency_overrides[get_role_service] = lambda: RoleService(
         RoleRepository(db_session), mock_redis_client
     )
+    app.dependency_overrides[get_role_read_service] = app.dependency_overrides[
+        get_role_service
+    ]
 
     app.dependency_overrides[get_user_service] = lambda: UserService(
         UserRepository(db_session), mock_redis_client
     )
+    app.dependency_overrides[get_user_read_service] = app.dependency_overrides[
+        get_user_service
+    ]
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://testserver"
@@ -82,6 +126,28 @@ async def _mock_redis_client():
     return mock
 
 
+@pytest.fixture(name="fake_redis_client")
+async def _fake_redis_client():
+    client = FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture(name="user_events")
+async def _user_events(request, db_session, fake_redis_client):
+    """Route user writes through fakeredis and subscribe to their events."""
+    # The client installs the default overrides, so it must be set up first
+    request.getfixturevalue("test_client")
+    app.dependency_overrides[get_user_service] = lambda: UserService(
+        UserRepository(db_session), fake_redis_client
+    )
+    pubsub = fake_redis_client.pubsub()
+    await pubsub.subscribe("user-events")
+    await pubsub.get_message(timeout=1)  # subscription confirmation
+    yield pubsub
+    await pubsub.aclose()
+
+
 @pytest.fixture
 async def user_service(db_session, mock_redis_client):
     repo = UserRepository(db_session)
@@ -101,3 +167,24 @@ async def role_service(db_session, mock_redis_client):
     repo = RoleRepository(db_session)
     service = RoleService(repo, mock_redis_client)
     return service
+
+
+@pytest.fixture(name="capture_logs")
+def _capture_logs():
+    """Attach a sink collecting messages that pass the given filter."""
+    handler_ids = []
+
+    def _capture(log_filter=None):
+        messages = []
+        handler_ids.append(
+            logger.add(
+                lambda message: messages.append(message.record["message"]),
+                level=0,
+                filter=log_filter,
+            )
+        )
+        return messages
+
+    yield _capture
+    for handler_id in handler_ids:
+        logger.remove(handler_id)
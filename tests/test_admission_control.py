@@ -0,0 +1,128 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+from prometheus_client import REGISTRY
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.api.dependencies import get_redis_client
+from app.core import security
+from app.core.rate_limit import AuthRateLimiter, Bucket
+from app.core.security import PasswordHasher
+from app.core.settings import settings
+from app.exceptions import ServiceUnavailableError, TooManyRequestsError
+from app.main import app
+
+
+@pytest.fixture(name="saturated_hasher")
+async def _saturated_hasher():
+    """A one-worker hasher whose only slot is held until the test ends."""
+    hasher = PasswordHasher(
+        executor_type="thread",
+        max_workers=1,
+        queue_size=0,
+        max_waiting=0,
+        wait_timeout=None,
+    )
+    release = threading.Event()
+    busy = asyncio.create_task(hasher.run("hash", release.wait))
+    await asyncio.sleep(0.01)
+    yield hasher
+    release.set()
+    await busy
+    hasher.shutdown()
+
+
+def _limiter(redis_client, email_burst=2, client_burst=10) -> AuthRateLimiter:
+    return AuthRateLimiter(
+        redis_client,
+        email_bucket=Bucket("email", email_burst, per_minute=60),
+        client_bucket=Bucket("client", client_burst, per_minute=60),
+    )
+
+
+@pytest.mark.asyncio
+async def test_saturated_hasher_rejects_instead_of_queueing(saturated_hasher):
+    with pytest.raises(ServiceUnavailableError):
+        await saturated_hasher.run("verify", lambda: True)
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_the_hasher_times_out(saturated_hasher):
+    saturated_hasher.max_waiting = None
+    saturated_hasher.wait_timeout = 0.05
+
+    with pytest.raises(ServiceUnavailableError):
+        await saturated_hasher.run("verify", lambda: True)
+    assert REGISTRY.get_sample_value("password_hash_waiting") == 0
+
+
+@pytest.mark.asyncio
+async def test_register_returns_503_when_hashing_is_saturated(
+    test_client, saturated_hasher, monkeypatch
+):
+    monkeypatch.setattr(security, "password_hasher", saturated_hasher)
+
+    response = await test_client.post(
+        "/auth/register",
+        json={"email": "busy@example.com", "password": "securepassword"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_email_bucket_empties_and_refills(fake_redis_client):
+    limiter = _limiter(fake_redis_client)
+
+    await limiter.check("login", "10.0.0.1", "user@example.com", now=100.0)
+    await limiter.check("login", "10.0.0.1", "USER@example.com ", now=100.0)
+    with pytest.raises(TooManyRequestsError) as exc_info:
+        await limiter.check("login", "10.0.0.1", "user@example.com", now=100.0)
+    assert exc_info.value.retry_after == 1
+
+    # Other emails are unaffected, and a second later one token is back
+    await limiter.check("login", "10.0.0.1", "other@example.com", now=100.0)
+    await limiter.check("login", "10.0.0.1", "user@example.com", now=101.0)
+
+
+@pytest.mark.asyncio
+async def test_client_bucket_spans_emails(fake_redis_client):
+    limiter = _limiter(fake_redis_client, email_burst=5, client_burst=2)
+
+    await limiter.check("login", "10.0.0.2", "a@example.com", now=100.0)
+    await limiter.check("login", "10.0.0.2", "b@example.com", now=100.0)
+    with pytest.raises(TooManyRequestsError):
+        await limiter.check("login", "10.0.0.2", "c@example.com", now=100.0)
+    # The refused attempt did not consume c@example.com's tokens
+    await limiter.check("login", "10.0.0.3", "c@example.com", now=100.0)
+
+
+@pytest.mark.asyncio
+async def test_limiter_lets_attempts_through_when_redis_fails():
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = AsyncMock(
+        side_effect=RedisConnectionError("down")
+    )
+
+    await _limiter(redis_client).check("login", "10.0.0.1", "user@example.com")
+
+
+@pytest.mark.asyncio
+async def test_login_returns_429_with_retry_after(
+    test_client, fake_redis_client, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_EMAIL_BURST", 1)
+    monkeypatch.setitem(
+        app.dependency_overrides, get_redis_client, lambda: fake_redis_client
+    )
+    credentials = {"email": "target@example.com", "password": "guess"}
+
+    first = await test_client.post("/auth/login", json=credentials)
+    second = await test_client.post("/auth/login", json=credentials)
+
+    assert first.status_code == 404
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
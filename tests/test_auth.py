@@ -1,6 +1,8 @@
 import pytest
+from sqlalchemy import update
 
 from app.core.security import verify_password
+from app.db.models import User
 from app.db.repositories.user_repo import UserRepository
 
 
@@ -35,3 +37,29 @@ async def test_user_registration_and_login(test_client, db_session):
     assert "access_token" in login_token_data
     assert "token_type" in login_token_data
     assert login_token_data["token_type"] == "bearer"
+
+
+@pytest.mark.asyncio
+async def test_registration_is_a_single_insert(test_client, record_statements):
+    with record_statements() as statements:
+        response = await test_client.post(
+            "/auth/register",
+            json={"email": "single@example.com", "password": "securepassword"},
+        )
+
+    assert response.status_code == 200
+    assert statements == ["INSERT"]
+
+
+@pytest.mark.asyncio
+async def test_inactive_user_cannot_log_in(test_client, db_session):
+    user_data = {"email": "inactive@example.com", "password": "securepassword"}
+    response = await test_client.post("/auth/register", json=user_data)
+    assert response.status_code == 200
+    await db_session.execute(
+        update(User).where(User.email == user_data["email"]).values(is_active=False)
+    )
+    await db_session.commit()
+
+    response = await test_client.post("/auth/login", json=user_data)
+    assert response.status_code == 403
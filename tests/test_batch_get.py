@@ -0,0 +1,109 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.loader import BatchLoader
+from app.db.models import User
+from app.exceptions import NotFoundError
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture(name="users")
+async def _users(user_service):
+    return [
+        await user_service.create(
+            UserCreate(email=f"batch{index}@example.com", password="pw")
+        )
+        for index in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_get_by_ids_keeps_request_order(test_client, users):
+    missing_id = str(uuid.uuid4())
+    ids = [str(users[2].id), missing_id, str(users[0].id)]
+
+    response = await test_client.post("/users/batch-get", json={"ids": ids})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert [user["email"] for user in result["items"]] == [
+        "batch2@example.com",
+        "batch0@example.com",
+    ]
+    assert result["missing"] == [missing_id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("users")
+async def test_batch_get_by_emails(test_client):
+    response = await test_client.post(
+        "/users/batch-get",
+        json={"emails": ["batch1@example.com", "nobody@example.com"]},
+    )
+    assert response.status_code == 200
+    assert [user["email"] for user in response.json()["items"]] == [
+        "batch1@example.com"
+    ]
+    assert response.json()["missing"] == ["nobody@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_batch_get_requires_one_key_kind(test_client):
+    response = await test_client.post("/users/batch-get", json={})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_query(
+    user_service, users, record_statements
+):
+    with record_statements() as statements:
+        results = await asyncio.gather(
+            user_service.get_by_id(users[0].id),
+            user_service.get_by_id(users[1].id),
+            user_service.get_by_field("email", "batch2@example.com"),
+            user_service.get_by_id(uuid.uuid4()),
+            return_exceptions=True,
+        )
+
+    # The email lookup is batched separately from the ID lookups
+    assert statements == ["SELECT", "SELECT"]
+    assert results[0].id == users[0].id
+    assert results[1].id == users[1].id
+    assert results[2][0].id == users[2].id
+    assert isinstance(results[3], NotFoundError)
+
+
+@pytest.mark.asyncio
+async def test_followers_fall_back_when_leader_is_cancelled(user_service, users):
+    leader = asyncio.create_task(user_service.get_by_id(users[0].id))
+    follower = asyncio.create_task(user_service.get_by_id(users[1].id))
+    await asyncio.sleep(0)  # both tasks are now waiting on the batch
+    leader.cancel()
+
+    assert (await follower).id == users[1].id
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_followers_get_entities_of_their_own_session(db_session, users):
+    loader = BatchLoader(User, "id", max_batch_size=10)
+    other_session = AsyncSession(bind=db_session.bind, expire_on_commit=False)
+
+    leader_user, follower_user, same_session_user = await asyncio.gather(
+        loader.load(db_session, users[0].id),
+        loader.load(other_session, users[0].id),
+        loader.load(db_session, users[0].id),
+    )
+
+    assert same_session_user is leader_user
+    assert follower_user is not leader_user
+    assert inspect(follower_user).session is other_session.sync_session
+    assert follower_user.email == leader_user.email
+    assert not other_session.dirty
+    await other_session.close()
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from app.core import security
+from app.core.security import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_conflicts(test_client, user_events):
+    response = await test_client.post(
+        "/auth/register",
+        json={"email": "existing@example.com", "password": "securepassword"},
+    )
+    assert response.status_code == 200
+    await user_events.get_message(timeout=1)  # registration event
+
+    response = await test_client.post(
+        "/users/bulk",
+        json=[
+            {"email": "bulk1@example.com", "password": "securepassword"},
+            {"email": "existing@example.com", "password": "securepassword"},
+            {"email": "bulk2@example.com", "password": "securepassword"},
+            {"email": "bulk1@example.com", "password": "securepassword"},
+        ],
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert sorted(user["email"] for user in result["created"]) == [
+        "bulk1@example.com",
+        "bulk2@example.com",
+    ]
+    assert [conflict["index"] for conflict in result["conflicts"]] == [1, 3]
+
+    events = []
+    while message := await user_events.get_message(timeout=1):
+        events.append(json.loads(message["data"]))
+    assert sorted(event["payload"]["email"] for event in events) == [
+        "bulk1@example.com",
+        "bulk2@example.com",
+    ]
+    assert all("hashed_password" not in event["payload"] for event in events)
+
+    response = await test_client.get("/users/by-email?email=bulk2@example.com")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_empty_batch(test_client):
+    response = await test_client.post("/users/bulk", json=[])
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_is_not_shed_beyond_hashing_capacity(
+    test_client, user_events, monkeypatch
+):
+    hasher = PasswordHasher(
+        executor_type="thread",
+        max_workers=1,
+        queue_size=1,
+        max_waiting=0,
+        wait_timeout=0.001,
+    )
+    monkeypatch.setattr(security, "password_hasher", hasher)
+    rows = [
+        {"email": f"capacity{index}@example.com", "password": "securepassword"}
+        for index in range(hasher.capacity * 3)
+    ]
+
+    try:
+        response = await test_client.post("/users/bulk", json=rows)
+    finally:
+        hasher.shutdown()
+
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == len(rows)
+    assert await user_events.get_message(timeout=1)
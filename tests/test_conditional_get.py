@@ -0,0 +1,100 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_group_etag_round_trip(test_client, record_statements):
+    response = await test_client.post("/groups/", json={"name": "etaggroup"})
+    group_id = response.json()["id"]
+
+    response = await test_client.get(f"/groups/{group_id}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag == '"1"'
+
+    with record_statements() as statements:
+        response = await test_client.get(
+            f"/groups/{group_id}", headers={"If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not response.content
+    assert statements == ["SELECT"]
+
+    await test_client.put(
+        f"/groups/{group_id}", json={"id": group_id, "name": "renamedgroup"}
+    )
+    response = await test_client.get(
+        f"/groups/{group_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+    assert response.json()["name"] == "renamedgroup"
+
+
+@pytest.mark.asyncio
+async def test_user_etag_accepts_weak_and_listed_tags(test_client):
+    response = await test_client.post(
+        "/users/", json={"email": "etag@example.com", "password": "pw"}
+    )
+    user_id = response.json()["id"]
+
+    response = await test_client.get(
+        f"/users/{user_id}", headers={"If-None-Match": 'W/"7", W/"1"'}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_for_missing_role_is_not_found(test_client):
+    response = await test_client.get("/roles/404", headers={"If-None-Match": '"1"'})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_if_match_guards_concurrent_role_updates(test_client):
+    response = await test_client.post("/roles/", json={"name": "guarded"})
+    role_id = response.json()["id"]
+    etag = (await test_client.get(f"/roles/{role_id}")).headers["ETag"]
+
+    response = await test_client.put(
+        f"/roles/{role_id}",
+        json={"id": role_id, "name": "first-writer"},
+        headers={"If-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+
+    # A second writer holding the old tag must not clobber the first
+    response = await test_client.put(
+        f"/roles/{role_id}",
+        json={"id": role_id, "name": "second-writer"},
+        headers={"If-Match": etag},
+    )
+    assert response.status_code == 412
+    assert (await test_client.get(f"/roles/{role_id}")).json()["name"] == (
+        "first-writer"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("if_match", ['W/"1"', "garbage"])
+async def test_if_match_without_strong_tag_fails(test_client, if_match):
+    response = await test_client.post("/groups/", json={"name": "weaktag"})
+    group_id = response.json()["id"]
+
+    response = await test_client.put(
+        f"/groups/{group_id}",
+        json={"id": group_id, "name": "changed"},
+        headers={"If-Match": if_match},
+    )
+    assert response.status_code == 412
+
+
+@pytest.mark.asyncio
+async def test_if_match_on_missing_user_is_not_found(test_client):
+    response = await test_client.put(
+        "/users/00000000-0000-0000-0000-000000000000",
+        json={"is_active": False},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == 404
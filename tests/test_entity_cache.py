@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.settings import settings
+from app.db.models import User
+from app.db.repositories.user_repo import UserRepository
+from app.schemas.user import UserCreate, UserUpdate
+from app.services.user_service import UserService
+
+
+@pytest.fixture(name="cached_user_service")
+async def _cached_user_service(db_session, fake_redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "ENTITY_CACHE_ENABLED", True)
+    return UserService(UserRepository(db_session), fake_redis_client)
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_reads_through_cache(cached_user_service, db_session):
+    user = await cached_user_service.create(
+        UserCreate(email="cached@example.com", password="securepassword")
+    )
+    await cached_user_service.get_by_id(user.id)
+
+    # Remove the row behind the cache's back; the cached copy is still served
+    await db_session.execute(delete(User).where(User.id == user.id))
+    await db_session.commit()
+
+    cached = await cached_user_service.get_by_id(user.id)
+    assert cached.id == user.id
+    assert cached.email == "cached@example.com"
+    assert cached.hashed_password is None
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_cached_entity(cached_user_service):
+    user = await cached_user_service.create(
+        UserCreate(email="before@example.com", password="securepassword")
+    )
+    cached = await cached_user_service.get_by_field("email", "before@example.com")
+    assert cached[0].id == user.id
+
+    await cached_user_service.update(user.id, UserUpdate(email="after@example.com"))
+
+    refreshed = await cached_user_service.get_by_id(user.id)
+    assert refreshed.email == "after@example.com"
+    assert await cached_user_service.get_by_field("email", "before@example.com") == []
+    renamed = await cached_user_service.get_by_field("email", "after@example.com")
+    assert renamed[0].id == user.id
+
+
+@pytest.mark.asyncio
+async def test_uncached_lookup_includes_sensitive_fields(cached_user_service):
+    await cached_user_service.create(
+        UserCreate(email="login@example.com", password="securepassword")
+    )
+    await cached_user_service.get_by_field("email", "login@example.com")
+
+    users = await cached_user_service.get_by_field(
+        "email", "login@example.com", use_cache=False
+    )
+    assert users[0].hashed_password is not None
+
+
+@pytest.mark.asyncio
+async def test_version_lookup_reads_cached_row(cached_user_service, db_session):
+    user = await cached_user_service.create(
+        UserCreate(email="versioned@example.com", password="securepassword")
+    )
+    await cached_user_service.get_by_id(user.id)
+    await cached_user_service.update(user.id, UserUpdate(is_active=False))
+    assert await cached_user_service.get_version(user.id) == 2
+
+    await cached_user_service.get_by_id(user.id)
+    await db_session.execute(delete(User).where(User.id == user.id))
+    await db_session.commit()
+    # Still answered from the cache entry
+    assert await cached_user_service.get_version(user.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_read_started_before_update_does_not_refill_cache(
+    cached_user_service, monkeypatch
+):
+    user = await cached_user_service.create(
+        UserCreate(email="racing@example.com", password="securepassword")
+    )
+    stale = User(id=user.id, email="racing@example.com", is_active=True, version=1)
+    loaded = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def _slow_load(_field_name, _value):
+        loaded.set()
+        await resume.wait()
+        return stale
+
+    # The read misses the cache and loads version 1, then stalls
+    monkeypatch.setattr(cached_user_service, "_load_one", _slow_load)
+    reader = asyncio.create_task(cached_user_service.get_by_id(user.id))
+    await loaded.wait()
+
+    await cached_user_service.update(user.id, UserUpdate(is_active=False))
+    resume.set()
+    assert (await reader).version == 1
+
+    # Version 1 was not written back over the update
+    assert await cached_user_service.cache.get(user.id) is None
+    assert await cached_user_service.get_version(user.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_read_started_before_delete_does_not_refill_cache(
+    cached_user_service, db_session
+):
+    user = await cached_user_service.create(
+        UserCreate(email="deleted@example.com", password="securepassword")
+    )
+    stale = await cached_user_service.repository.get_by_id(user.id)
+    db_session.expunge(stale)
+
+    await cached_user_service.delete(user.id)
+    await cached_user_service.cache.set(stale)
+
+    assert await cached_user_service.cache.get(user.id) is None
@@ -0,0 +1,47 @@
+import pytest
+
+from app.api.dependencies import get_redis_client
+from app.core.settings import settings
+from app.db.repositories.role_repo import RoleRepository
+from app.main import app
+from app.schemas.roles import RoleCreate
+from app.services.role_service import RoleService
+
+
+@pytest.fixture(name="streams_backend")
+def _streams_backend(monkeypatch, fake_redis_client):
+    monkeypatch.setattr(settings, "EVENT_BACKEND", "streams")
+    app.dependency_overrides[get_redis_client] = lambda: fake_redis_client
+    yield
+    app.dependency_overrides.pop(get_redis_client, None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("streams_backend")
+async def test_events_are_appended_to_stream_and_replayed(
+    test_client, db_session, fake_redis_client
+):
+    service = RoleService(RoleRepository(db_session), fake_redis_client)
+    for name in ("admin", "editor", "viewer"):
+        await service.create(RoleCreate(name=name))
+
+    assert await fake_redis_client.xlen("role-events") == 3
+
+    response = await test_client.get("/events/role", params={"count": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [e["event"]["payload"]["name"] for e in page["events"]] == [
+        "admin",
+        "editor",
+    ]
+
+    response = await test_client.get("/events/role", params={"after": page["next_id"]})
+    assert response.status_code == 200
+    page = response.json()
+    assert [e["event"]["payload"]["name"] for e in page["events"]] == ["viewer"]
+
+
+@pytest.mark.asyncio
+async def test_replay_requires_streams_backend(test_client):
+    response = await test_client.get("/events/user")
+    assert response.status_code == 400
@@ -0,0 +1,91 @@
+from loguru import logger
+import pytest
+
+from app.core.logs import LogFilter, parse_levels, sampled_logger
+from app.db.repositories.user_repo import UserRepository
+from app.schemas.user import UserCreate
+from app.services.user_service import UserService
+
+
+def test_parse_levels():
+    assert not parse_levels("")
+    assert parse_levels(" app.api = debug ,app.db=WARNING,bogus") == {
+        "app.api": "DEBUG",
+        "app.db": "WARNING",
+    }
+
+
+def test_module_levels_use_most_specific_prefix(capture_logs):
+    log_filter = LogFilter(
+        "WARNING", {"tests": "INFO", "tests.test_logging": "DEBUG"}, 1.0
+    )
+    assert log_filter.min_level == logger.level("DEBUG").no
+    messages = capture_logs(log_filter)
+
+    logger.trace("trace")
+    logger.debug("debug")
+    assert messages == ["debug"]
+
+    strict = capture_logs(LogFilter("DEBUG", {"tests": "ERROR"}, 1.0))
+    logger.warning("warning")
+    logger.error("error")
+    assert strict == ["error"]
+
+
+class FormatProbe:
+    """Counts how often loguru formats it into a message."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __format__(self, spec):
+        self.formatted += 1
+        return "probe"
+
+
+def test_sampling_drops_only_sampled_success_messages(capture_logs, monkeypatch):
+    monkeypatch.setattr(sampled_logger, "log_filter", LogFilter("DEBUG", {}, 0.0))
+    messages = capture_logs()
+    probe = FormatProbe()
+
+    sampled_logger.info("sampled info {probe}", probe=probe)
+    sampled_logger.warning("sampled warning")
+    logger.info("plain info")
+    assert messages == ["sampled warning", "plain info"]
+    assert probe.formatted == 0
+
+
+def test_module_level_is_checked_before_formatting(capture_logs, monkeypatch):
+    monkeypatch.setattr(
+        sampled_logger, "log_filter", LogFilter("DEBUG", {"tests": "WARNING"}, 1.0)
+    )
+    messages = capture_logs()
+    probe = FormatProbe()
+
+    sampled_logger.info("suppressed {probe}", probe=probe)
+    sampled_logger.warning("kept {probe}", probe=probe)
+    assert messages == ["kept probe"]
+    assert probe.formatted == 1
+
+
+def test_sample_rate_one_keeps_everything(capture_logs, monkeypatch):
+    monkeypatch.setattr(sampled_logger, "log_filter", LogFilter("DEBUG", {}, 1.0))
+    messages = capture_logs()
+
+    for index in range(5):
+        sampled_logger.info("Fetched {index}", index=index)
+    assert messages == [f"Fetched {index}" for index in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_create_does_not_log_password(
+    capture_logs, db_session, fake_redis_client
+):
+    messages = capture_logs()
+    service = UserService(UserRepository(db_session), fake_redis_client)
+
+    await service.create(
+        UserCreate(email="quiet@example.com", password="do-not-log-me")
+    )
+    assert messages
+    assert not any("do-not-log-me" in message for message in messages)
@@ -0,0 +1,66 @@
+from prometheus_client import REGISTRY
+import pytest
+from sqlalchemy import select
+
+from app.db.instrumentation import instrument_queries
+from app.db.models import User
+from app.schemas.roles import RoleCreate
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_per_route_template(test_client):
+    labels = {"method": "GET", "route": "/roles/{role_id}", "status": "404"}
+    before = _sample("http_request_duration_seconds_count", labels)
+
+    await test_client.get("/roles/101")
+    await test_client.get("/roles/102")
+
+    assert _sample("http_request_duration_seconds_count", labels) == before + 2
+    assert (
+        _sample(
+            "http_requests_in_progress",
+            {"method": "GET", "route": "/roles/{role_id}"},
+        )
+        == 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_series(test_client):
+    await test_client.get("/roles/101")
+
+    response = await test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/roles/{role_id}"' in response.text
+    assert "password_hash_duration_seconds" in response.text
+
+
+@pytest.mark.asyncio
+async def test_query_durations_are_recorded_by_operation(db_session):
+    instrument_queries(db_session.bind, "metrics-test")
+    labels = {"pool": "metrics-test", "operation": "SELECT"}
+    before = _sample("db_query_duration_seconds_count", labels)
+
+    await db_session.execute(select(User))
+
+    assert _sample("db_query_duration_seconds_count", labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_publish_failures_are_counted(role_service, mock_redis_client):
+    labels = {"channel": "role-events"}
+    failures = _sample("event_publish_failures_total", labels)
+    publishes = _sample("event_publish_duration_seconds_count", labels)
+
+    await role_service.create(RoleCreate(name="counted", description="ok"))
+    mock_redis_client.publish.side_effect = ConnectionError("redis down")
+    with pytest.raises(ConnectionError):
+        await role_service.create(RoleCreate(name="lost", description="fails"))
+
+    assert _sample("event_publish_failures_total", labels) == failures + 1
+    assert _sample("event_publish_duration_seconds_count", labels) == publishes + 2
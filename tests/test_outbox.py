@@ -0,0 +1,78 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.settings import settings
+from app.db.models import OutboxEvent
+from app.db.repositories.group_repo import GroupRepository
+from app.schemas.groups import GroupCreate, GroupUpdate
+from app.services.group_service import GroupService
+from app.services.outbox_relay import OutboxRelay
+
+
+async def _outbox_count(db_session) -> int:
+    result = await db_session.execute(select(func.count()).select_from(OutboxEvent))
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_outbox_defers_publishing_to_relay(
+    db_session, fake_redis_client, monkeypatch
+):
+    monkeypatch.setattr(settings, "EVENT_OUTBOX_ENABLED", True)
+    service = GroupService(GroupRepository(db_session), fake_redis_client)
+    pubsub = fake_redis_client.pubsub()
+    await pubsub.subscribe("group-events")
+    await pubsub.get_message(timeout=1)  # subscription confirmation
+
+    group = await service.create(GroupCreate(name="outboxgroup"))
+    await service.update(group.id, GroupUpdate(id=group.id, name="renamed"))
+
+    # Nothing reaches Redis until the relay runs
+    assert await pubsub.get_message(timeout=0.1) is None
+    assert await _outbox_count(db_session) == 2
+
+    relay = OutboxRelay(
+        async_sessionmaker(db_session.bind, class_=AsyncSession),
+        fake_redis_client,
+        batch_size=10,
+        poll_interval=0.01,
+        max_backoff=0.1,
+    )
+    assert await relay.run_once() == 2
+
+    events = []
+    while message := await pubsub.get_message(timeout=0.1):
+        events.append(json.loads(message["data"]))
+    assert [event["event_type"] for event in events] == ["create", "update"]
+    assert events[1]["payload"] == {"id": group.id, "name": "renamed"}
+    assert await _outbox_count(db_session) == 0
+
+    await pubsub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_events_when_redis_fails(db_session, mock_redis_client):
+    db_session.add(OutboxEvent(channel="group-events", payload="{}"))
+    await db_session.commit()
+    mock_redis_client.pipeline = MagicMock(
+        side_effect=RedisConnectionError("redis is down")
+    )
+
+    relay = OutboxRelay(
+        async_sessionmaker(db_session.bind, class_=AsyncSession),
+        mock_redis_client,
+        batch_size=10,
+        poll_interval=0.01,
+        max_backoff=0.1,
+    )
+    with pytest.raises(RedisConnectionError):
+        await relay.run_once()
+
+    event = (await db_session.execute(select(OutboxEvent))).scalar_one()
+    await db_session.refresh(event)
+    assert event.attempts == 1
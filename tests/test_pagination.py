@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_list_roles_walks_pages_with_cursor(test_client):
+    for index in range(5):
+        response = await test_client.post("/roles/", json={"name": f"role{index}"})
+        assert response.status_code == 200
+
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await test_client.get("/roles/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        names.extend(role["name"] for role in page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == [f"role{index}" for index in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_list_users_rejects_invalid_cursor(test_client):
+    response = await test_client.get("/users/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_list_groups_enforces_page_size_ceiling(test_client):
+    response = await test_client.get(
+        "/groups/", params={"limit": settings.PAGE_SIZE_MAX + 1}
+    )
+    assert response.status_code == 422
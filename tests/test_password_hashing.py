@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+from prometheus_client import REGISTRY
+import pytest
+
+from app.core.security import (
+    PasswordHasher,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_roundtrip():
+    hashed = await hash_password_async("securepassword")
+
+    assert verify_password("securepassword", hashed)
+    assert await verify_password_async("securepassword", hashed)
+    assert not await verify_password_async("wrongpassword", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_bounds_work_handed_to_the_pool():
+    hasher = PasswordHasher(executor_type="thread", max_workers=1, queue_size=2)
+    lock = threading.Lock()
+    baseline = REGISTRY.get_sample_value("password_hash_queue_depth")
+    running = 0
+    peak_running = 0
+    peak_submitted = 0
+
+    def slow_operation():
+        nonlocal running, peak_running, peak_submitted
+        with lock:
+            running += 1
+            peak_running = max(peak_running, running)
+            submitted = REGISTRY.get_sample_value("password_hash_queue_depth")
+            peak_submitted = max(peak_submitted, submitted - baseline)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return True
+
+    try:
+        results = await asyncio.gather(
+            *(hasher.run("hash", slow_operation) for _ in range(8))
+        )
+    finally:
+        hasher.shutdown()
+
+    assert results == [True] * 8
+    assert peak_running == 1
+    # Callers beyond max_workers + queue_size wait on the loop, not in the pool
+    assert peak_submitted == hasher.max_workers + hasher.queue_size
+
+
+def test_password_hasher_rejects_unknown_executor():
+    with pytest.raises(ValueError):
+        PasswordHasher(executor_type="fiber", max_workers=1, queue_size=1)
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.settings import settings
+from app.db.instrumentation import (
+    QueryStats,
+    instrument_queries,
+    redact_parameters,
+    track_queries,
+)
+from app.db.models import User
+
+
+@pytest.fixture(name="instrumented_session")
+def _instrumented_session(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_STATS_ENABLED", True)
+    # Treat every statement as slow so the slow-query log can be checked
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.000001)
+    instrument_queries(db_session.bind, "query-stats")
+    return db_session
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("instrumented_session")
+async def test_response_reports_query_count_and_time(test_client):
+    response = await test_client.get("/roles/101")
+
+    assert response.status_code == 404
+    assert int(response.headers["X-DB-Query-Count"]) >= 1
+    assert float(response.headers["X-DB-Query-Time"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_headers_are_absent_when_disabled(test_client):
+    response = await test_client.get("/roles/101")
+    assert "X-DB-Query-Count" not in response.headers
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("instrumented_session")
+async def test_repeated_statements_are_reported(test_client, capture_logs, monkeypatch):
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 0)
+    messages = capture_logs()
+
+    await test_client.get("/roles/101")
+
+    assert any(
+        "times in GET /roles/{role_id}" in message and "FROM roles" in message
+        for message in messages
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_without_values(
+    instrumented_session, capture_logs
+):
+    messages = capture_logs()
+
+    with track_queries() as stats:
+        await instrumented_session.execute(
+            select(User).filter(User.email == "secret@example.com")
+        )
+
+    assert stats.count == 1
+    slow = [message for message in messages if message.startswith("Slow query")]
+    assert len(slow) == 1
+    assert "FROM users" in slow[0]
+    assert "<str>" in slow[0]
+    assert "secret@example.com" not in slow[0]
+
+
+def test_repeated_groups_in_lists_of_any_length():
+    stats = QueryStats()
+    stats.record("SELECT * FROM users WHERE id = ?", 0.001)
+    stats.record("SELECT * FROM users WHERE id = ?", 0.001)
+    stats.record("SELECT * FROM roles WHERE id IN (?, ?)", 0.001)
+    stats.record(
+        "SELECT * FROM roles WHERE id IN ($1::UUID, $2::UUID, $3::UUID)", 0.001
+    )
+
+    assert stats.count == 4
+    assert sorted(stats.repeated(1)) == [
+        ("SELECT * FROM roles WHERE id IN (?)", 2),
+        ("SELECT * FROM users WHERE id = ?", 2),
+    ]
+    assert not stats.repeated(2)
+
+
+def test_redact_parameters():
+    assert redact_parameters(("a@example.com", 3)) == "<str>, <int>"
+    assert redact_parameters({"email": "a@example.com"}) == "email=<str>"
+    assert redact_parameters([("a",), ("b",)]) == "<2 parameter sets>"
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.dependencies import get_role_read_service
+from app.db.models import Base, Role
+from app.db.routing import PrimaryStickiness
+from app.db.session import ReadSessionLocal, database
+from app.main import app
+
+
+@pytest.fixture(name="replica")
+async def _replica(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmaker(engine, class_=AsyncSession)() as session:
+        session.add(Role(name="replicarole"))
+        await session.commit()
+
+    monkeypatch.setattr(database, "replica", engine)
+    ReadSessionLocal.configure(bind=engine)
+    yield engine
+    ReadSessionLocal.configure(bind=None)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("replica")
+async def test_reads_use_replica_until_client_writes(test_client):
+    # Use the real read-service chain rather than the primary-only override
+    app.dependency_overrides.pop(get_role_read_service)
+    headers = {"Authorization": "Bearer client-a"}
+
+    response = await test_client.get("/roles/by-name?name=replicarole", headers=headers)
+    assert response.status_code == 200
+
+    response = await test_client.post(
+        "/roles/", json={"name": "primaryrole"}, headers=headers
+    )
+    assert response.status_code == 200
+
+    # The writer reads its own write from the primary...
+    response = await test_client.get("/roles/by-name?name=primaryrole", headers=headers)
+    assert response.status_code == 200
+
+    # ...while other clients keep reading from the replica
+    response = await test_client.get(
+        "/roles/by-name?name=primaryrole",
+        headers={"Authorization": "Bearer client-b"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("replica")
+async def test_read_only_post_does_not_pin_client(test_client):
+    app.dependency_overrides.pop(get_role_read_service)
+    headers = {"Authorization": "Bearer batch-reader"}
+
+    response = await test_client.post(
+        "/users/batch-get", json={"emails": ["nobody@example.com"]}, headers=headers
+    )
+    assert response.status_code == 200
+
+    # Still served by the replica, which alone has this role
+    response = await test_client.get("/roles/by-name?name=replicarole", headers=headers)
+    assert response.status_code == 200
+
+
+def test_primary_stickiness_expires():
+    stickiness = PrimaryStickiness(window=0)
+    stickiness.mark(b"client")
+    assert not stickiness.is_sticky(b"client")
+
+    stickiness = PrimaryStickiness(window=60, max_clients=2)
+    for key in (b"a", b"b", b"c"):
+        stickiness.mark(key)
+    assert not stickiness.is_sticky(b"a")
+    assert stickiness.is_sticky(b"c")
@@ -0,0 +1,33 @@
+import pytest
+
+from app.db.models import Group
+from app.exceptions import NotFoundError
+from app.schemas.groups import GroupCreate, GroupUpdate
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_run_one_statement_each(
+    group_service, db_session, record_statements
+):
+    group = await group_service.create(GroupCreate(name="returning"))
+
+    with record_statements() as statements:
+        updated = await group_service.update(
+            group.id, GroupUpdate(id=group.id, name="renamed")
+        )
+    assert statements == ["UPDATE"]
+    assert updated.name == "renamed"
+
+    with record_statements() as statements:
+        assert await group_service.delete(group.id) is True
+    assert statements == ["DELETE"]
+    assert await db_session.get(Group, group.id) is None
+
+
+@pytest.mark.asyncio
+async def test_missing_rows_raise_not_found(group_service, mock_redis_client):
+    with pytest.raises(NotFoundError):
+        await group_service.update(404, GroupUpdate(id=404, name="missing"))
+    with pytest.raises(NotFoundError):
+        await group_service.delete(404)
+    mock_redis_client.publish.assert_not_awaited()
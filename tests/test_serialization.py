@@ -0,0 +1,44 @@
+import json
+
+from pydantic import TypeAdapter
+import pytest
+
+from app.schemas.pagination import Page
+from app.schemas.user import UserCreate, UserRetrieve
+
+
+@pytest.mark.asyncio
+async def test_fast_page_matches_model_serialization(test_client, user_service):
+    for index in range(3):
+        await user_service.create(
+            UserCreate(
+                email=f"fast{index}@example.com", password="pw", first_name="Fast"
+            )
+        )
+    entities, next_cursor = await user_service.get_page(limit=2)
+    expected = json.loads(
+        TypeAdapter(Page[UserRetrieve]).dump_json(
+            TypeAdapter(Page[UserRetrieve]).validate_python(
+                {"items": entities, "next_cursor": next_cursor}, from_attributes=True
+            )
+        )
+    )
+
+    response = await test_client.get("/users/?limit=2")
+
+    assert response.status_code == 200
+    assert response.json() == expected
+    assert "hashed_password" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_lookup_response_is_validated_against_schema(test_client):
+    await test_client.post(
+        "/users/", json={"email": "lookup@example.com", "password": "pw"}
+    )
+
+    response = await test_client.get("/users/by-email?email=lookup@example.com")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert set(response.json()) == set(UserRetrieve.model_fields)
@@ -0,0 +1,147 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+import pytest
+
+from app.core.singleflight import SingleFlight
+from app.db.models import User
+from app.schemas.roles import RoleCreate
+from app.schemas.user import UserCreate, UserUpdate
+
+
+def _shared(label: str) -> float:
+    return (
+        REGISTRY.get_sample_value("single_flight_shared_total", {"model": label}) or 0.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def _read():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"name": "hot"}
+
+    callers = [
+        asyncio.create_task(flight.do("key", _read, label="test")) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+
+    # Nothing is kept once the flight has landed
+    await flight.do("key", _read, label="test")
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_with_waiting_callers():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def _failing_read():
+        await release.wait()
+        raise RuntimeError("database unavailable")
+
+    callers = [asyncio.create_task(flight.do("key", _failing_read)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_waiting_caller_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    calls = 0
+
+    async def _read():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    leader = asyncio.create_task(flight.do("key", _read))
+    follower = asyncio.create_task(flight.do("key", _read))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_service_lookups_for_the_same_name_share_a_read(
+    role_service, record_statements
+):
+    await role_service.create(RoleCreate(name="hotrole"))
+    shared = _shared("Role")
+
+    with record_statements() as statements:
+        results = await asyncio.gather(
+            *(role_service.get_by_field("name", "hotrole") for _ in range(10))
+        )
+
+    assert statements == ["SELECT"]
+    assert all(result[0].name == "hotrole" for result in results)
+    assert _shared("Role") == shared + 9
+
+
+@pytest.mark.asyncio
+async def test_waiting_callers_adopt_the_shared_result():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def _read():
+        await release.wait()
+        return ["row"]
+
+    async def _copy(result):
+        return list(result)
+
+    leader = asyncio.create_task(flight.do("key", _read, adopt=_copy))
+    follower = asyncio.create_task(flight.do("key", _read, adopt=_copy))
+    await asyncio.sleep(0)
+    release.set()
+    leader_result, follower_result = await asyncio.gather(leader, follower)
+
+    assert follower_result == leader_result
+    assert follower_result is not leader_result
+
+
+@pytest.mark.asyncio
+async def test_reads_after_a_write_start_a_new_flight(user_service, monkeypatch):
+    user = await user_service.create(
+        UserCreate(email="flight@example.com", password="securepassword")
+    )
+    stale = User(id=user.id, email="flight@example.com", is_active=True, version=1)
+    loaded = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def _load_one(_field_name, value):
+        if not loaded.is_set():
+            loaded.set()
+            await resume.wait()
+            return stale
+        return await user_service.repository.get_by_id(value)
+
+    monkeypatch.setattr(user_service, "_load_one", _load_one)
+    early_reader = asyncio.create_task(user_service.get_by_id(user.id))
+    await loaded.wait()
+
+    await user_service.update(user.id, UserUpdate(is_active=False))
+    late_read = await asyncio.wait_for(user_service.get_by_id(user.id), timeout=1)
+    resume.set()
+
+    assert late_read.version == 2
+    assert (await early_reader).version == 1
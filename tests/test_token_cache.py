@@ -0,0 +1,62 @@
+from datetime import timedelta
+import time
+
+from prometheus_client import REGISTRY
+import pytest
+
+from app.core.security import (
+    TokenCache,
+    create_access_token,
+    decode_access_token,
+    token_cache,
+)
+
+
+def _sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+
+def test_decode_access_token_serves_repeat_tokens_from_cache():
+    token_cache.clear()
+    token = create_access_token({"sub": "cached@example.com"})
+    hits = _sample("jwt_cache_hits_total")
+    misses = _sample("jwt_cache_misses_total")
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    assert first["sub"] == "cached@example.com"
+    assert _sample("jwt_cache_misses_total") == misses + 1
+    assert _sample("jwt_cache_hits_total") == hits + 1
+
+
+def test_expired_token_is_evicted_and_rejected():
+    token_cache.clear()
+    token = create_access_token(
+        {"sub": "expired@example.com"}, expires_delta=timedelta(seconds=-1)
+    )
+    token_cache.set(token, {"sub": "expired@example.com", "exp": time.time() - 1})
+
+    with pytest.raises(ValueError, match="Token expired"):
+        decode_access_token(token)
+    assert len(token_cache) == 0
+
+
+def test_token_cache_is_bounded():
+    cache = TokenCache(max_size=2)
+    expires_at = time.time() + 60
+    for token in ("a", "b", "c"):
+        cache.set(token, {"sub": token, "exp": expires_at})
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c")["sub"] == "c"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_invalid_token(test_client):
+    response = await test_client.get(
+        "/users/me", headers={"Authorization": "Bearer not-a-token"}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+
+from app.core.security import create_access_token, decode_access_token
+from app.db.models import Group, Role, group_users, user_roles
+
+
+@pytest.mark.asyncio
+async def test_login_token_carries_role_and_group_claims(test_client, db_session):
+    credentials = {"email": "claims@example.com", "password": "securepassword"}
+    response = await test_client.post("/auth/register", json=credentials)
+    assert response.status_code == 200
+    claims = decode_access_token(response.json()["access_token"])
+    assert claims["roles"] == []
+    assert claims["groups"] == []
+    user_id = uuid.UUID(claims["id"])
+
+    db_session.add_all([Role(id=1, name="admin"), Group(id=1, name="engineering")])
+    await db_session.flush()
+    await db_session.execute(user_roles.insert().values(user_id=user_id, role_id=1))
+    await db_session.execute(group_users.insert().values(user_id=user_id, group_id=1))
+    await db_session.commit()
+
+    response = await test_client.post("/auth/login", json=credentials)
+    assert response.status_code == 200
+    claims = decode_access_token(response.json()["access_token"])
+    assert claims["sub"] == "claims@example.com"
+    assert claims["id"] == str(user_id)
+    assert claims["roles"] == ["admin"]
+    assert claims["groups"] == ["engineering"]
+
+
+@pytest.mark.asyncio
+async def test_current_user_profile_is_fetched_by_id_claim(test_client):
+    response = await test_client.post(
+        "/auth/register",
+        json={"email": "me@example.com", "password": "securepassword"},
+    )
+    token = response.json()["access_token"]
+
+    response = await test_client.get(
+        "/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == decode_access_token(token)["id"]
+
+    # Tokens without an ID claim still resolve through the email
+    legacy_token = create_access_token({"sub": "me@example.com"})
+    response = await test_client.get(
+        "/users/me", headers={"Authorization": f"Bearer {legacy_token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["email"] == "me@example.com"
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture(name="exported_users")
+async def _exported_users(user_service):
+    await user_service.create(
+        UserCreate(email="active@example.com", password="securepassword")
+    )
+    await user_service.create(
+        UserCreate(
+            email="inactive@example.com", password="securepassword", is_active=False
+        )
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("exported_users")
+async def test_export_users_as_ndjson(test_client):
+    response = await test_client.get("/users/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["email"] for row in rows) == [
+        "active@example.com",
+        "inactive@example.com",
+    ]
+    assert all("hashed_password" not in row for row in rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("exported_users")
+async def test_export_users_as_csv_with_filter(test_client):
+    response = await test_client.get("/users/export?format=csv&is_active=false")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["email"] for row in rows] == ["inactive@example.com"]
+    assert rows[0]["is_active"] == "False"
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(test_client):
+    response = await test_client.get("/users/export?format=xml")
+    assert response.status_code == 422
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.db.repositories.user_repo import UserRepository
+from app.services import base_service
+from app.services.user_service import UserService
+
+
+@pytest.fixture(name="existing_user")
+async def _existing_user(test_client, user_events):
+    response = await test_client.post(
+        "/users/", json={"email": "existing@example.com", "password": "pw"}
+    )
+    assert response.status_code == 200
+    await user_events.get_message(timeout=1)  # creation event
+
+
+async def _drain(pubsub) -> list[dict]:
+    events = []
+    while (message := await pubsub.get_message(timeout=0.1)) is not None:
+        events.append(json.loads(message["data"]))
+    return events
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("existing_user")
+async def test_import_users_from_ndjson(test_client, db_session, user_events):
+    body = "".join(
+        json.dumps(record) + "\n"
+        for record in (
+            {"email": "first@example.com", "password": "pw"},
+            {"email": "existing@example.com", "password": "pw"},
+            {"email": "not-an-email", "password": "pw"},
+            {"email": "second@example.com", "password": "pw", "first_name": "Ada"},
+            {"email": "first@example.com", "password": "pw"},
+        )
+    )
+    response = await test_client.post("/users/import", content=body.encode())
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["inserted"] == 2
+    assert summary["skipped"] == 2
+    assert summary["invalid"] == 1
+    assert summary["errors"][0]["line"] == 3
+
+    user = await UserRepository(db_session).get_user_by_email("second@example.com")
+    assert user.first_name == "Ada"
+    events = await _drain(user_events)
+    assert sorted(event["payload"]["email"] for event in events) == [
+        "first@example.com",
+        "second@example.com",
+    ]
+    assert all("hashed_password" not in event["payload"] for event in events)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("existing_user")
+async def test_import_users_from_csv_in_batches(test_client, monkeypatch):
+    monkeypatch.setattr("app.core.settings.settings.IMPORT_BATCH_SIZE", 2)
+    body = (
+        "email,password,first_name,is_active\n"
+        "a@example.com,pw,,true\n"
+        "b@example.com,pw,Bea,false\n"
+        "c@example.com,pw\n"
+        "d@example.com,pw,,\n"
+    )
+    response = await test_client.post("/users/import?format=csv", content=body)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "inserted": 3,
+        "skipped": 0,
+        "invalid": 1,
+        "errors": [{"line": 4, "detail": "Expected 4 columns, got 2"}],
+        "unpublished": 0,
+        "failed": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_non_utf8_body(test_client):
+    response = await test_client.post("/users/import", content=b"\xff\xfe{}\n")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Import body is not valid UTF-8"
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_returns_the_partial_summary(
+    test_client, db_session, user_events, monkeypatch
+):
+    monkeypatch.setattr("app.core.settings.settings.IMPORT_BATCH_SIZE", 2)
+    import_many = UserService.import_many
+    batches = 0
+
+    async def _fail_second_batch(self, create_data, conflict_field):
+        nonlocal batches
+        batches += 1
+        if batches == 2:
+            raise RuntimeError("database went away")
+        return await import_many(self, create_data, conflict_field)
+
+    monkeypatch.setattr(UserService, "import_many", _fail_second_batch)
+    body = "".join(
+        json.dumps({"email": f"partial{index}@example.com", "password": "pw"}) + "\n"
+        for index in range(6)
+    )
+    response = await test_client.post("/users/import", content=body.encode())
+
+    assert response.status_code == 500
+    summary = response.json()
+    assert summary["inserted"] == 2
+    assert summary["failed"]["first_line"] == 3
+    assert summary["failed"]["last_line"] == 4
+    # The third batch was never attempted
+    assert batches == 2
+
+    repository = UserRepository(db_session)
+    assert await repository.get_user_by_email("partial1@example.com")
+    assert await repository.get_user_by_email("partial2@example.com") is None
+    events = await _drain(user_events)
+    assert len(events) == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_after_commit_is_not_a_failed_batch(
+    test_client, db_session, user_events, monkeypatch
+):
+    monkeypatch.setattr("app.core.settings.settings.IMPORT_BATCH_SIZE", 2)
+    publish_many = base_service.publish_many
+    publishes = 0
+
+    async def _fail_second_publish(redis_client, messages):
+        nonlocal publishes
+        publishes += 1
+        if publishes == 2:
+            raise RedisConnectionError("redis went away")
+        await publish_many(redis_client, messages)
+
+    monkeypatch.setattr(base_service, "publish_many", _fail_second_publish)
+    body = "".join(
+        json.dumps({"email": f"published{index}@example.com", "password": "pw"}) + "\n"
+        for index in range(6)
+    )
+    response = await test_client.post("/users/import", content=body.encode())
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["inserted"] == 6
+    assert summary["unpublished"] == 2
+    assert summary["failed"] is None
+
+    # The batch whose events were lost is still committed
+    repository = UserRepository(db_session)
+    assert await repository.get_user_by_email("published2@example.com")
+    assert len(await _drain(user_events)) == 4